@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+"""Measures the time taken to deserialise a LicenseData fragment.
+
+The table driven dispatch of truepy._bean.deserialize is compared with trying
+every deserialiser in order until one does not raise
+UnknownFragmentException.
+
+Run from the repository root with ``python benchmarks/deserialize.py``.
+"""
+
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'lib'))
+
+from truepy import LicenseData, fromstring, tostring
+from truepy import _bean, _bean_serializers
+from truepy._bean import UnknownFragmentException, serialize
+
+
+#: The number of deserialisations per measurement
+COUNT = 5000
+
+
+#: The deserialisers in the order in which they were previously tried
+LINEAR = [
+    _bean_serializers.bool_deserializer,
+    _bean_serializers.int_deserializer,
+    _bean_serializers.str_deserializer,
+    _bean_serializers.datetime_deserializer,
+    _bean_serializers.object_deserializer]
+
+
+def linear_deserialize(element):
+    for deserializer in LINEAR:
+        try:
+            return deserializer(element)
+        except UnknownFragmentException:
+            pass
+
+    raise ValueError('unknown XML fragment')
+
+
+def measure(deserialize, element):
+    # Nested values are deserialised through the module global
+    original = _bean_serializers.deserialize
+    _bean_serializers.deserialize = deserialize
+    try:
+        return min(timeit.repeat(
+            lambda: deserialize(element),
+            number=COUNT,
+            repeat=5)) / COUNT
+    finally:
+        _bean_serializers.deserialize = original
+
+
+def main():
+    element = fromstring(tostring(serialize(LicenseData(
+        '2014-01-01T00:00:00',
+        '2014-01-01T00:00:01',
+        issuer='CN=issuer',
+        holder='CN=holder',
+        subject='subject',
+        info='info',
+        extra={'hello': 'world'}))))
+    count = sum(1 for _ in element.iter())
+
+    linear = measure(linear_deserialize, element)
+    indexed = measure(_bean.deserialize, element)
+    print('linear:\t%6.1f us/LicenseData\t%5.2f us/element' % (
+        linear * 1e6, linear * 1e6 / count))
+    print('indexed:\t%6.1f us/LicenseData\t%5.2f us/element (%.2fx)' % (
+        indexed * 1e6, indexed * 1e6 / count, linear / indexed))
+
+
+if __name__ == '__main__':
+    main()
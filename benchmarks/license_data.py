@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+"""Measures the time taken to deserialise a LicenseContent fragment.
+
+The schema specific deserialiser of LicenseData is compared with the generic
+bean deserialiser.
+
+Run from the repository root with ``python benchmarks/license_data.py``.
+"""
+
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'lib'))
+
+from truepy import LicenseData, fromstring, tostring
+from truepy._bean import serialize
+from truepy._bean_serializers import default_bean_deserialize
+
+
+#: The number of deserialisations per measurement
+COUNT = 200
+
+#: The number of measurements; the minimum is reported, and the alternatives
+#: are measured alternately to reduce the effect of noise
+REPEAT = 30
+
+
+def generic(element):
+    return default_bean_deserialize(LicenseData, element)
+
+
+def specific(element):
+    return LicenseData._bean_deserialize(element)
+
+
+def measure(element, *deserializers):
+    results = [[] for deserializer in deserializers]
+    for i in range(REPEAT):
+        for deserializer, result in zip(deserializers, results):
+            result.append(timeit.timeit(
+                lambda: deserializer(element),
+                number=COUNT) / COUNT)
+    return [min(result) for result in results]
+
+
+def main():
+    element = fromstring(tostring(serialize(LicenseData(
+        '2014-01-01T00:00:00',
+        '2014-01-01T00:00:01',
+        issuer='CN=issuer',
+        holder='CN=holder',
+        subject='subject',
+        consumer_type='consumer type',
+        info='info',
+        extra={'hello': 'world'}))))
+
+    generic_time, specific_time = measure(element, generic, specific)
+    print('generic:\t%6.1f us/LicenseData' % (generic_time * 1e6))
+    print('specific:\t%6.1f us/LicenseData (%.2fx)' % (
+        specific_time * 1e6, generic_time / specific_time))
+
+
+if __name__ == '__main__':
+    main()
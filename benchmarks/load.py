@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+"""Measures the time taken to parse a decrypted license with its license data.
+
+Building an element tree for the license and then parsing the embedded
+document, as :meth:`truepy.License.load` and :attr:`truepy.License.data` do, is
+compared with a single parsing pass, where the embedded document is fed to a
+second parser directly from the character data of the license document.
+
+The embedded document is an escaped string, so its markup is tokenised by the
+second parser in either case. The single pass is slower, since the parser
+reports the character data in one call per entity reference.
+
+Run from the repository root with ``python benchmarks/load.py``.
+"""
+
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'lib'))
+
+from xml.etree.ElementTree import XMLParser
+
+from truepy import License, fromstring
+from truepy._bean import deserialize
+
+from tests.license_test import license
+
+
+#: The number of licenses to parse per measurement
+COUNT = 200
+
+#: The number of measurements; the minimum is reported, and the alternatives
+#: are measured alternately to reduce the effect of noise
+REPEAT = 30
+
+
+class SinglePassTarget(object):
+    """A parser target reading a license, and feeding the embedded license
+    data to a second parser as it is encountered.
+    """
+    def __init__(self):
+        self.depth = 0
+        self.properties = {}
+        self.name = None
+        self.parts = None
+        self.parser = XMLParser()
+
+    def start(self, tag, attrib):
+        self.depth += 1
+        if self.depth == 3:
+            self.name = attrib.get('property')
+        elif self.depth == 4:
+            self.parts = []
+
+    def end(self, tag):
+        if self.depth == 4:
+            self.properties[self.name] = ''.join(self.parts).strip()
+            self.parts = None
+        self.depth -= 1
+
+    def data(self, text):
+        if self.parts is not None:
+            self.parts.append(text)
+            if self.name == 'encoded':
+                self.parser.feed(text)
+
+    def close(self):
+        license = License(
+            self.properties['encoded'],
+            self.properties['signature'],
+            self.properties['signatureAlgorithm'])
+        license._data = deserialize(self.parser.close()[0])
+        return license
+
+
+def double_parse(document):
+    result = deserialize(fromstring(document)[0])
+    result.data
+    return result
+
+
+def single_parse(document):
+    parser = XMLParser(target=SinglePassTarget())
+    parser.feed(document)
+    return parser.close()
+
+
+def measure(document, *parsers):
+    results = [[] for parser in parsers]
+    for i in range(REPEAT):
+        for parser, result in zip(parsers, results):
+            result.append(timeit.timeit(
+                lambda: parser(document),
+                number=COUNT) / COUNT)
+    return [min(result) for result in results]
+
+
+def main():
+    key, iv = License._key_iv(b'valid password')
+    document = b''.join(License._inflate(License._decrypt(license(), key, iv)))
+
+    double, single = measure(document, double_parse, single_parse)
+    print('license and data, element tree:\t%6.1f us/license' % (
+        double * 1e6))
+    print('license and data, single pass:\t%6.1f us/license (%.2fx)' % (
+        single * 1e6, double / single))
+
+
+if __name__ == '__main__':
+    main()
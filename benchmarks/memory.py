@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+"""Measures the memory retained by loaded licenses.
+
+Licenses are loaded with their license data decoded and kept in a list, and
+the memory allocated while loading them is reported per license, as traced by
+tracemalloc.
+
+Run from the repository root with ``python benchmarks/memory.py [count]``.
+"""
+
+import gc
+import io
+import os
+import sys
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'lib'))
+
+from truepy import License, LicenseCodec, LicenseData
+
+from tests.license_test import CERTIFICATE, key
+
+
+#: The default number of licenses to load
+COUNT = 100000
+
+
+def footprint(data, count, decode):
+    codec = LicenseCodec(b'password')
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        licenses = [
+            codec.load(io.BytesIO(data))
+            for i in range(count)]
+        if decode:
+            for license in licenses:
+                license.data
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(licenses) == count
+    return float(after - before) / count
+
+
+def main(count=COUNT):
+    data = LicenseCodec(b'password').dumps(License.issue(
+        CERTIFICATE,
+        key(),
+        license_data=LicenseData(
+            '2014-01-01T00:00:00',
+            '2014-01-01T00:00:01',
+            holder='CN=holder,O=organisation',
+            subject='subject',
+            info='info',
+            extra={'features': ['a', 'b']})))
+
+    print('%d licenses' % count)
+    print('license only:\t%8.1f bytes/license' % footprint(
+        data, count, False))
+    print('license and data:\t%8.1f bytes/license' % footprint(
+        data, count, True))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
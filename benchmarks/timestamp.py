@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+"""Measures the time taken to convert timestamps.
+
+The timestamp codec is compared with the previous implementation, which parsed
+the epoch with strptime for every conversion, both for single conversions and
+for deserialising many license data fragments.
+
+Run from the repository root with ``python benchmarks/timestamp.py``.
+"""
+
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'lib'))
+
+from datetime import datetime, timedelta
+
+from truepy import LicenseData, fromstring, tostring
+from truepy import _timestamp
+from truepy._bean import UnknownFragmentException, serialize
+
+
+#: The number of operations per measurement
+COUNT = 1000
+
+#: The number of measurements; the minimum is reported, and the alternatives
+#: are measured alternately to reduce the effect of noise
+REPEAT = 15
+
+
+def strptime_to_milliseconds(value):
+    timedelta_since_epoch = value \
+        - datetime.strptime('1970-01-01 UTC', '%Y-%m-%d %Z')
+    return int(timedelta_since_epoch.total_seconds() * 1000)
+
+
+def strptime_from_milliseconds(value):
+    return datetime.strptime('1970-01-01 UTC', '%Y-%m-%d %Z') + timedelta(
+        milliseconds=value)
+
+
+def strptime_parse(value):
+    return datetime.strptime(
+        value + ' UTC',
+        LicenseData.TIMESTAMP_FORMAT + ' %Z')
+
+
+def strptime_datetime_deserializer(element):
+    if element.tag == 'object' \
+            and element.attrib.get('class', None) == 'java.util.Date':
+        return strptime_from_milliseconds(int(element.find('long').text))
+    else:
+        raise UnknownFragmentException()
+
+
+def strptime_bulk(elements):
+    properties = LicenseData._PROPERTIES
+    LicenseData._PROPERTIES = {
+        key: (name, strptime_datetime_deserializer)
+        if name in ('not_before', 'not_after', 'issued')
+        else (name, deserializer)
+        for key, (name, deserializer) in properties.items()}
+    try:
+        return [LicenseData._bean_deserialize(e) for e in elements]
+    finally:
+        LicenseData._PROPERTIES = properties
+
+
+def codec_bulk(elements):
+    return [LicenseData._bean_deserialize(e) for e in elements]
+
+
+def measure(*functions):
+    results = [[] for function in functions]
+    for i in range(REPEAT):
+        for (function, argument, number), result in zip(functions, results):
+            result.append(timeit.timeit(
+                lambda: function(argument),
+                number=number) / number)
+    return [min(result) for result in results]
+
+
+def main():
+    timestamp = datetime(2014, 1, 1, 12, 30, 15)
+    elements = [
+        fromstring(tostring(serialize(LicenseData(
+            '2014-01-01T00:00:00',
+            '2014-01-%02dT00:00:01' % (i % 28 + 1),
+            issuer='CN=issuer',
+            holder='CN=holder'))))
+        for i in range(COUNT)]
+
+    rows = (
+        ('to milliseconds', 'us', 1e6, 1,
+            (strptime_to_milliseconds, timestamp, COUNT),
+            (_timestamp.to_milliseconds, timestamp, COUNT)),
+        ('from milliseconds', 'us', 1e6, 1,
+            (strptime_from_milliseconds, 1388579415000, COUNT),
+            (_timestamp.from_milliseconds, 1388579415000, COUNT)),
+        ('parse', 'us', 1e6, 1,
+            (strptime_parse, '2014-01-01T12:30:15', COUNT),
+            (_timestamp.parse, '2014-01-01T12:30:15', COUNT)),
+        ('bulk load', 'us/license', 1e6, COUNT,
+            (strptime_bulk, elements, 1),
+            (codec_bulk, elements, 1)))
+    for name, unit, scale, count, previous, codec in rows:
+        previous_time, codec_time = measure(previous, codec)
+        print('%s:\t%8.2f %s strptime\t%8.2f %s codec (%.2fx)' % (
+            name,
+            previous_time * scale / count, unit,
+            codec_time * scale / count, unit,
+            previous_time / codec_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+"""Measures how License.verify_many scales with the number of threads.
+
+Run from the repository root with ``python benchmarks/verify_many.py``.
+"""
+
+import multiprocessing
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'lib'))
+
+from truepy import License, LicenseData
+
+from tests.license_test import CERTIFICATE, key
+
+
+#: The number of licenses to verify
+COUNT = 2000
+
+
+def main():
+    license = License.issue(
+        CERTIFICATE,
+        key(),
+        license_data=LicenseData(
+            '2014-01-01T00:00:00',
+            '2014-01-01T00:00:01'))
+    licenses = [license] * COUNT
+
+    baseline = min(timeit.repeat(
+        lambda: [license.verify(CERTIFICATE) for license in licenses],
+        number=1,
+        repeat=3))
+    print('License.verify loop:\t%8.1f licenses/s' % (COUNT / baseline))
+
+    workers = 1
+    while workers <= 2 * multiprocessing.cpu_count():
+        elapsed = min(timeit.repeat(
+            lambda: list(License.verify_many(licenses, CERTIFICATE, workers)),
+            number=1,
+            repeat=3))
+        print('verify_many, %2d workers:%8.1f licenses/s (%.2fx)' % (
+            workers, COUNT / elapsed, baseline / elapsed))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -16,18 +16,13 @@
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
 
-from xml.etree.ElementTree import tostring as _tostring
-from xml.etree.ElementTree import fromstring
-
-
-import sys
-if sys.version_info.major > 2:
-    def tostring(e):
-        return str(_tostring(e), 'ascii')
-else:
-    tostring = _tostring
+from ._xml import fromstring, tostring, get_xml_backend, set_xml_backend
 
 from ._info import *
+from ._cache import LRUCache
 from ._license_data import LicenseData
 from ._license import License
+from ._codec import LicenseCodec
 from ._name import Name
+from ._verifier import Verifier
+from . import bulk
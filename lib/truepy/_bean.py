@@ -15,9 +15,7 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
-from xml.etree import ElementTree
-
-from . import tostring
+from ._xml import Element, SubElement, tostring
 
 
 def snake_to_camel(s):
@@ -78,10 +76,10 @@ def value_to_xml(value, tag_name, class_name=None):
     :rtype: xml.etree.ElementTree.Element
     """
     if class_name is None:
-        o = ElementTree.Element(tag_name)
+        o = Element(tag_name)
         o.text = value
     else:
-        o = ElementTree.Element('object', attrib={
+        o = Element('object', attrib={
             'class': class_name})
         o.append(value_to_xml(value, tag_name))
 
@@ -132,11 +130,11 @@ def _serialize_object(value):
         for k, v in o.__class__.__dict__.items()
         if isinstance(getattr(o.__class__, k), property))
 
-    java_wrapper = ElementTree.Element('java', attrib={
+    java_wrapper = Element('java', attrib={
         'version': '1.0',
         'class': 'java.beans.XMLDecoder'})
 
-    container = ElementTree.SubElement(java_wrapper, 'object', attrib={
+    container = SubElement(java_wrapper, 'object', attrib={
         'class': class_name})
     for property_name in property_names:
         container.append(
@@ -163,25 +161,210 @@ def serialize(value):
     except KeyError:
         pass
 
+    class_name, plan = _serialization_plan(value)
+
+    xml = Element('object', attrib={
+        'class': class_name})
+    for getter, property_name in plan:
+        property_value = serialize(getter(value))
+        property_container = SubElement(xml, 'void', attrib={
+            'property': property_name})
+        property_container.append(property_value)
+
+    return xml
+
+
+#: A mapping from bean class to serialisation plan
+_PLANS = {}
+
+
+def serialization_plan(cls):
+    """Compiles the serialisation plan for a class.
+
+    The plan lists the properties of the class in the order in which they are
+    serialised, as tuples of property getter and *camelCase* property name.
+
+    :param type cls: The class for which to compile a plan. This must have the
+        attribute ``bean_class``.
+
+    :return: the plan
+    :rtype: tuple
+    """
+    return tuple(
+        (getattr(cls, property_name).fget, snake_to_camel(property_name))
+        for property_name in sorted(
+            k
+            for k, v in cls.__dict__.items()
+            if isinstance(v, property)))
+
+
+def _serialization_plan(value):
+    """Returns the Java class name and serialisation plan for a value.
+
+    Plans for classes registered with :func:`register_serialization_plan`
+    are looked up, and plans for other classes are compiled on every call.
+
+    :param object value: The value to serialise.
+
+    :return: the tuple ``(class_name, plan)``
+
+    :raises ValueError: if the value has no Java class name
+    """
     try:
         class_name = getattr(value, 'bean_class')
     except AttributeError:
         raise ValueError('unknown Java class for %s', type(value))
 
-    property_names = sorted(
-        k
-        for k, v in value.__class__.__dict__.items()
-        if isinstance(getattr(value.__class__, k), property))
+    try:
+        return (class_name, _PLANS[value.__class__])
+    except KeyError:
+        return (class_name, serialization_plan(value.__class__))
 
-    xml = ElementTree.Element('object', attrib={
-        'class': class_name})
-    for property_name in property_names:
-        property_value = serialize(getattr(value, property_name))
-        property_container = ElementTree.SubElement(xml, 'void', attrib={
-            'property': snake_to_camel(property_name)})
-        property_container.append(property_value)
 
-    return xml
+def register_serialization_plan(cls):
+    """Compiles and caches the serialisation plan for a class.
+
+    The cached plan is used by :func:`serialize` for all instances of ``cls``;
+    it must therefore be registered again if the properties of ``cls`` are
+    changed.
+
+    :param type cls: The class for which to register a plan.
+    """
+    _PLANS[cls] = serialization_plan(cls)
+
+
+def escape_text(s):
+    """Escapes character data for inclusion in an XML document.
+
+    The escaping is identical to that performed by
+    :func:`xml.etree.ElementTree.tostring`.
+
+    :param str s: The string to escape.
+
+    :return: an escaped string
+    :rtype: str
+    """
+    if '&' in s:
+        s = s.replace('&', '&amp;')
+    if '<' in s:
+        s = s.replace('<', '&lt;')
+    if '>' in s:
+        s = s.replace('>', '&gt;')
+    return s
+
+
+def escape_attribute(s):
+    """Escapes an attribute value for inclusion in an XML document.
+
+    The escaping is identical to that performed by
+    :func:`xml.etree.ElementTree.tostring`.
+
+    :param str s: The string to escape.
+
+    :return: an escaped string
+    :rtype: str
+    """
+    s = escape_text(s)
+    if '"' in s:
+        s = s.replace('"', '&quot;')
+    if '\r' in s:
+        s = s.replace('\r', '&#13;')
+    if '\n' in s:
+        s = s.replace('\n', '&#10;')
+    if '\t' in s:
+        s = s.replace('\t', '&#09;')
+    return s
+
+
+def value_to_text(value, tag_name, class_name=None):
+    """Serialises a value to XML text.
+
+    The text is identical to ``tostring(value_to_xml(value, tag_name,
+    class_name))``, but no element is created.
+
+    :param str value: The value.
+
+    :param str tag_name: The tag name to use for the value.
+
+    :param str class_name: The Java class name to use.
+
+    :return: XML text
+    :rtype: str
+    """
+    if class_name is not None:
+        return '<object class="%s">%s</object>' % (
+            escape_attribute(class_name),
+            value_to_text(value, tag_name))
+    elif value:
+        return '<%s>%s</%s>' % (tag_name, escape_text(value), tag_name)
+    else:
+        return '<%s />' % tag_name
+
+
+#: A mapping of emitter name to emitter
+_EMITTERS = {}
+
+
+def bean_emitter(*value_types):
+    """Marks a function as an emitter for a specific type.
+
+    An emitter is the text equivalent of a serialiser: the function is passed
+    a single value, and must return the same text as ``tostring`` returns for
+    the element created by the serialiser for the type.
+
+    :param value_types: The types that this emitter is capable of emitting.
+    """
+    def inner(f):
+        for value_type in value_types:
+            _EMITTERS[value_type] = f
+        return f
+
+    return inner
+
+
+def emit(value, write):
+    """Serialises a value to XML text without creating any elements.
+
+    The value type must have an emitter or a serialiser registered, or be an
+    object with the attribute 'bean_class' whose properties can be emitted.
+
+    The concatenated fragments are identical to ``tostring(serialize(value))``.
+
+    :param object value: The value to serialise.
+
+    :param callable write: A callable invoked with every text fragment.
+
+    :raises ValueError: if the value cannot be serialised
+    """
+    emitter = _EMITTERS.get(type(value))
+    if emitter is not None:
+        write(emitter(value))
+        return
+
+    serializer = _SERIALIZERS.get(type(value))
+    if serializer is not None:
+        write(tostring(serializer(value)))
+        return
+
+    class_name, plan = _serialization_plan(value)
+    if plan:
+        write('<object class="%s">' % escape_attribute(class_name))
+        for getter, property_name in plan:
+            write('<void property="%s">' % escape_attribute(property_name))
+            emit(getter(value), write)
+            write('</void>')
+        write('</object>')
+    else:
+        write('<object class="%s" />' % escape_attribute(class_name))
+
+
+#: The text preceding the serialised value in an XML document
+_DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<java version="1.0" class="java.beans.XMLDecoder">')
+
+#: The text following the serialised value in an XML document
+_DOCUMENT_TAIL = '</java>'
 
 
 def to_document(e):
@@ -195,11 +378,44 @@ def to_document(e):
     :return: a valid XML document string
     :rtype: str
     """
-    return (
-        '<?xml version="1.0" encoding="utf-8"?>'
-        '<java version="1.0" class="java.beans.XMLDecoder">'
-        '%s'
-        '</java>') % tostring(e)
+    return _DOCUMENT_HEAD + tostring(e) + _DOCUMENT_TAIL
+
+
+def encode_document(value):
+    """Serialises a value to an *ASCII* encoded XML document.
+
+    The document is identical to ``to_document(serialize(value))`` encoded as
+    *ASCII*, but no elements are created.
+
+    :param object value: The value to serialise.
+
+    :return: a valid XML document
+    :rtype: bytes
+
+    :raises ValueError: if the value cannot be serialised
+    """
+    fragments = [_DOCUMENT_HEAD]
+    emit(value, fragments.append)
+    fragments.append(_DOCUMENT_TAIL)
+    return ''.join(fragments).encode('ascii', 'xmlcharrefreplace')
+
+
+def write_document(value, f):
+    """Serialises a value as an XML document to a stream.
+
+    The data written is the document returned by :func:`encode_document`,
+    but it is written in fragments without first constructing the document.
+
+    :param object value: The value to serialise.
+
+    :param f: The data stream.
+    :type f: file or stream
+
+    :raises ValueError: if the value cannot be serialised
+    """
+    f.write(_DOCUMENT_HEAD.encode('ascii'))
+    emit(value, lambda s: f.write(s.encode('ascii', 'xmlcharrefreplace')))
+    f.write(_DOCUMENT_TAIL.encode('ascii'))
 
 
 class UnknownFragmentException(Exception):
@@ -209,19 +425,40 @@ class UnknownFragmentException(Exception):
     pass
 
 
-#: A mapping from deserialiser name to deserialiser
+#: The deserialisers tried in order for fragments not found in
+#: :data:`_DESERIALIZER_INDEX`
 _DESERIALIZERS = []
 
+#: A mapping from the tuple ``(tag, class_name)`` to deserialiser
+_DESERIALIZER_INDEX = {}
+
 
-def bean_deserializer(f):
+def bean_deserializer(tag, class_name=None):
     """Marks a function as a deserialiser.
 
+    When used as ``@bean_deserializer('tag')`` or
+    ``@bean_deserializer('tag', 'class_name')``, the function is registered
+    for XML fragments with the tag name ``tag`` and the ``class`` attribute
+    ``class_name``; if ``class_name`` is ``None``, the fragment must not have a
+    ``class`` attribute. Such deserialisers are looked up directly.
+
+    When used as ``@bean_deserializer`` without arguments, the function is
+    tried in order of registration for all fragments not handled by a
+    registered deserialiser.
+
     The function is passed an xml.etree.ElementTree.Element. If the function is
     not capable of deserialising the XML, it must raise
     UnknownFragmentException.
     """
-    _DESERIALIZERS.append(f)
-    return f
+    if callable(tag):
+        _DESERIALIZERS.append(tag)
+        return tag
+
+    def inner(f):
+        _DESERIALIZER_INDEX[(tag, class_name)] = f
+        return f
+
+    return inner
 
 
 def deserialize(element):
@@ -238,13 +475,21 @@ def deserialize(element):
 
     :raises ValueError: if the value cannot be serialised
     """
+    deserializer = _DESERIALIZER_INDEX.get(
+        (element.tag, element.get('class')))
+    if deserializer is not None:
+        try:
+            return deserializer(element)
+        except UnknownFragmentException:
+            pass
+
     for deserializer in _DESERIALIZERS:
         try:
             return deserializer(element)
         except UnknownFragmentException:
             pass
 
-    raise ValueError('unknown XML fragment: %s', ElementTree.tostring(element))
+    raise ValueError('unknown XML fragment: %s', tostring(element))
 
 
 from  ._bean_serializers import *
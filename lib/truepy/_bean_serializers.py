@@ -18,10 +18,12 @@
 import sys
 import types
 
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from ._bean import bean_serializer, bean_deserializer, camel_to_snake, \
-    deserialize, value_to_xml, UnknownFragmentException
+from ._bean import bean_serializer, bean_deserializer, bean_emitter, \
+    camel_to_snake, deserialize, register_serialization_plan, value_to_text, \
+    value_to_xml, UnknownFragmentException
+from ._timestamp import from_milliseconds, to_milliseconds
 
 
 @bean_serializer(bool)
@@ -47,14 +49,38 @@ if sys.version_info.major < 3:
 
 @bean_serializer(datetime)
 def datetime_serializer(v):
-    timedelta_since_epoch = v \
-        - datetime.strptime('1970-01-01 UTC', '%Y-%m-%d %Z')
-    ms_since_epoch = int(timedelta_since_epoch.total_seconds() * 1000)
     return value_to_xml(
-        str(ms_since_epoch), 'long', 'java.util.Date')
+        str(to_milliseconds(v)), 'long', 'java.util.Date')
 
 
-@bean_deserializer
+@bean_emitter(bool)
+def bool_emitter(value):
+    return '<boolean>true</boolean>' if value else '<boolean>false</boolean>'
+
+
+@bean_emitter(int)
+def int_emitter(value):
+    return '<int>%d</int>' % value
+
+
+@bean_emitter(str)
+def str_emitter(value):
+    return value_to_text(value, 'string')
+
+
+if sys.version_info.major < 3:
+    @bean_emitter(unicode)
+    def str_emitter_py2_unicode(value):
+        return value_to_text(value, 'string')
+
+
+@bean_emitter(datetime)
+def datetime_emitter(v):
+    return value_to_text(
+        str(to_milliseconds(v)), 'long', 'java.util.Date')
+
+
+@bean_deserializer('boolean')
 def bool_deserializer(element):
     if element.tag == 'boolean':
         value = element.text.strip()
@@ -68,7 +94,7 @@ def bool_deserializer(element):
         raise UnknownFragmentException()
 
 
-@bean_deserializer
+@bean_deserializer('int')
 def int_deserializer(element):
     if element.tag == 'int':
         return int(element.text.strip())
@@ -76,7 +102,7 @@ def int_deserializer(element):
         raise UnknownFragmentException()
 
 
-@bean_deserializer
+@bean_deserializer('string')
 def str_deserializer(element):
     if element.tag == 'string':
         return (element.text or '').strip()
@@ -84,13 +110,96 @@ def str_deserializer(element):
         raise UnknownFragmentException()
 
 
-@bean_deserializer
+@bean_deserializer('long')
+def long_deserializer(element):
+    if element.tag == 'long':
+        return int(element.text.strip())
+    else:
+        raise UnknownFragmentException()
+
+
+@bean_deserializer('double')
+@bean_deserializer('float')
+def float_deserializer(element):
+    if element.tag in ('double', 'float'):
+        return float(element.text.strip())
+    else:
+        raise UnknownFragmentException()
+
+
+@bean_deserializer('null')
+def null_deserializer(element):
+    if element.tag == 'null':
+        return None
+    else:
+        raise UnknownFragmentException()
+
+
+def list_deserializer(element):
+    """Deserialises a *java.util.List*.
+
+    The XML must be like
+    ``<object class="java.util.ArrayList"><void method="add">...</void>...
+    </object>``, with one value for every ``void`` element.
+
+    :param element: The XML fragment to deserialise.
+
+    :return: a list
+    :rtype: list
+    """
+    result = []
+    for e in element:
+        if e.tag != 'void' or e.get('method') != 'add' or len(e) != 1:
+            raise UnknownFragmentException()
+        result.append(deserialize(e[0]))
+    return result
+
+
+def map_deserializer(element):
+    """Deserialises a *java.util.Map*.
+
+    The XML must be like
+    ``<object class="java.util.HashMap"><void method="put">...</void>...
+    </object>``, with a key and a value for every ``void`` element.
+
+    :param element: The XML fragment to deserialise.
+
+    :return: a mapping
+    :rtype: dict
+
+    :raises ValueError: if a key is not hashable
+    """
+    result = {}
+    for e in element:
+        if e.tag != 'void' or e.get('method') != 'put' or len(e) != 2:
+            raise UnknownFragmentException()
+        key, value = deserialize(e[0]), deserialize(e[1])
+        try:
+            result[key] = value
+        except TypeError:
+            raise ValueError('invalid map key: %s', key)
+    return result
+
+
+for class_name in (
+        'java.util.ArrayList',
+        'java.util.LinkedList',
+        'java.util.Vector'):
+    bean_deserializer('object', class_name)(list_deserializer)
+for class_name in (
+        'java.util.HashMap',
+        'java.util.Hashtable',
+        'java.util.LinkedHashMap',
+        'java.util.TreeMap'):
+    bean_deserializer('object', class_name)(map_deserializer)
+del class_name
+
+
+@bean_deserializer('object', 'java.util.Date')
 def datetime_deserializer(element):
     if element.tag == 'object' \
             and element.attrib.get('class', None) == 'java.util.Date':
-        ms_since_epoch = int(element.find('.//long').text)
-        return datetime.strptime('1970-01-01 UTC', '%Y-%m-%d %Z') + timedelta(
-            milliseconds=ms_since_epoch)
+        return from_milliseconds(int(element.find('long').text))
     else:
         raise UnknownFragmentException()
 
@@ -104,8 +213,9 @@ def default_bean_deserialize(self, element):
     `@`:meth:`~truepy._bean_serializers.bean_class`.
 
     This function will call the constructor with all properties read from
-    element as named arguments. If this fails with `TypeError`, it will call
-    the empty constructor and then set all properties.
+    the direct ``void`` children of element as named arguments. If this fails
+    with `TypeError`, it will call the empty constructor and then set all
+    properties.
 
     :param xml.etree.ElementTree.Element element: The XML fragment to
         deserialise.
@@ -114,7 +224,8 @@ def default_bean_deserialize(self, element):
     """
     properties = {
         camel_to_snake(e.attrib['property']): deserialize(e[0])
-        for e in element.findall('.//void')}
+        for e in element
+        if e.tag == 'void' and 'property' in e.attrib}
 
     try:
         return self(**properties)
@@ -133,6 +244,9 @@ def bean_class(class_name):
     A class decorated with this decorator does not need to define the
     `bean_class` attribute.
 
+    The serialisation plan of the class is compiled when it is decorated, so
+    properties must not be added to the class later.
+
     The class method `_bean_deserialize` will be called when the XML fragment
     `<object class="(class_name)">...</object>` is encountered. If the class
     does not have this callable, it will be set to
@@ -145,6 +259,8 @@ def bean_class(class_name):
             c._bean_deserialize = types.MethodType(default_bean_deserialize, c)
         c.bean_class = class_name
         _DESERIALIZER_CLASSES[class_name] = c
+        bean_deserializer('object', class_name)(object_deserializer)
+        register_serialization_plan(c)
         return c
 
     return inner
@@ -0,0 +1,233 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import threading
+import time
+
+
+class LRUCache(object):
+    #: The value used to signal a missing entry
+    _MISSING = object()
+
+    @property
+    def size(self):
+        """The maximum number of entries in this cache"""
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        if value < 0:
+            raise ValueError('invalid cache size: %s', value)
+        with self._lock:
+            self._size = value
+            self._shrink()
+
+    @property
+    def hits(self):
+        """The number of lookups that found a cached value"""
+        return self._hits
+
+    @property
+    def misses(self):
+        """The number of lookups that did not find a cached value"""
+        return self._misses
+
+    @property
+    def ttl(self):
+        """The number of seconds after which an entry expires, or ``None``"""
+        return self._ttl
+
+    @property
+    def evictions(self):
+        """The number of entries removed to make room for new ones"""
+        return self._evictions
+
+    def __init__(self, size=128, on_evict=None, ttl=None,
+                 clock=getattr(time, 'monotonic', time.time)):
+        """A bounded, thread safe cache evicting the least recently used
+        entries.
+
+        :param int size: The maximum number of entries. A size of ``0``
+            disables the cache.
+
+        :param callable on_evict: A callback invoked with the key and value of
+            every entry that is evicted, expired or cleared.
+
+        :param float ttl: The number of seconds after which an entry expires.
+            If not specified, entries do not expire.
+
+        :param callable clock: The function used to read the current time
+            when ``ttl`` is specified.
+        """
+        self._lock = threading.RLock()
+        self._entries = collections.OrderedDict()
+        self._expires = {}
+        self._ttl = ttl
+        self._clock = clock
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.on_evict = on_evict
+        self.size = size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries and (
+                self._ttl is None or self._expires[key] > self._clock())
+
+    def get(self, key, default=None):
+        """Looks up a cached value.
+
+        A successful lookup marks the entry as most recently used.
+
+        :param key: The cache key.
+
+        :param default: The value to return if ``key`` is not cached.
+
+        :return: the cached value, or ``default``
+        """
+        with self._lock:
+            value = self._pop(key)
+            if value is self._MISSING:
+                self._misses += 1
+                return default
+            else:
+                self._entries[key] = value
+                self._hits += 1
+                return value
+
+    def put(self, key, value, replace=True):
+        """Caches a value, evicting the least recently used entries if the
+        cache is full.
+
+        :param key: The cache key.
+
+        :param value: The value to cache.
+
+        :param bool replace: Whether to replace a value already cached for
+            ``key``. If this is ``False``, the cached value is kept and
+            ``value`` is dropped.
+
+        :return: the cached value
+        """
+        with self._lock:
+            previous = self._pop(key)
+            if previous is not self._MISSING:
+                if not replace:
+                    self._entries[key] = previous
+                    return previous
+                elif previous is not value and self.on_evict is not None:
+                    self.on_evict(key, previous)
+            if self._size > 0:
+                self._entries[key] = value
+                if self._ttl is not None:
+                    self._expires[key] = self._clock() + self._ttl
+                self._shrink()
+            else:
+                self._expires.pop(key, None)
+            return value
+
+    def lookup(self, key, factory, copy=None):
+        """Looks up a cached value, creating and caching it if missing.
+
+        ``factory`` is called without holding the cache lock, so concurrent
+        lookups of the same missing key may call it more than once; the value
+        cached first is kept, and the others are dropped.
+
+        :param key: The cache key.
+
+        :param callable factory: A callable creating the value from ``key``.
+
+        :param callable copy: A callable applied to the value while the cache
+            lock is held. Use this when ``on_evict`` modifies evicted values.
+
+        :return: the cached or created value, or its copy
+        """
+        with self._lock:
+            value = self.get(key, self._MISSING)
+            if value is not self._MISSING:
+                return value if copy is None else copy(value)
+
+        value = factory(key)
+        with self._lock:
+            value = self.put(key, value, replace=False)
+            return value if copy is None else copy(value)
+
+    def clear(self):
+        """Removes all entries and resets the statistics.
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+            self._expires.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+        if self.on_evict is not None:
+            for key, value in entries:
+                self.on_evict(key, value)
+
+    def stats(self):
+        """Returns the cache statistics.
+
+        :return: a mapping with the keys ``'hits'``, ``'misses'``,
+            ``'evictions'``, ``'size'`` and ``'length'``
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=self._size,
+                length=len(self._entries))
+
+    def _pop(self, key):
+        """Removes an entry, evicting it if it has expired.
+
+        This method must be called with the lock held.
+
+        :param key: The cache key.
+
+        :return: the value, or :attr:`_MISSING` if ``key`` is not cached or
+            has expired
+        """
+        value = self._entries.pop(key, self._MISSING)
+        if value is not self._MISSING and self._ttl is not None \
+                and self._expires[key] <= self._clock():
+            del self._expires[key]
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+            value = self._MISSING
+        return value
+
+    def _shrink(self):
+        """Evicts entries until the cache fits its size.
+
+        This method must be called with the lock held.
+        """
+        while len(self._entries) > self._size:
+            key, value = self._entries.popitem(last=False)
+            self._expires.pop(key, None)
+            self._evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(key, value)
@@ -0,0 +1,105 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import io
+
+from ._license import License
+
+
+class LicenseCodec(object):
+    def __init__(self, password):
+        """A class loading and storing licenses encrypted with a specific
+        password.
+
+        The encryption key is derived once, when the codec is created, so
+        loading and storing many licenses with the same password does not pay
+        for the key derivation on every call.
+
+        :param bytes password: The password used by the licensed application.
+        """
+        self._key, self._iv = License._key_iv(password)
+
+    def load(self, f, chunk_size=None):
+        """Loads a license from a stream.
+
+        :param f: The data stream.
+        :type f: file or stream
+
+        :param int chunk_size: If specified, the stream is read, decrypted,
+            decompressed and parsed incrementally, this many bytes at a time.
+            Otherwise the entire stream is read at once.
+
+        :return: a license object
+        :rtype: truepy.License
+
+        :raises ValueError: if the input data is invalid
+        :raises truepy.License.InvalidPasswordException: if the password is
+            invalid
+        """
+        return License._load(f, self._key, self._iv, chunk_size)
+
+    def load_path(self, path):
+        """Loads a license from a file.
+
+        The file is memory mapped; see :meth:`truepy.License.load_path`.
+
+        :param str path: The path of the license file.
+
+        :return: a license object
+        :rtype: truepy.License
+
+        :raises ValueError: if the file data is invalid
+        :raises truepy.License.InvalidPasswordException: if the password is
+            invalid
+        """
+        return License._load_path(path, self._key, self._iv)
+
+    def loads(self, data):
+        """Loads a license from a byte string.
+
+        :param bytes data: The encrypted license data.
+
+        :return: a license object
+        :rtype: truepy.License
+
+        :raises ValueError: if the input data is invalid
+        :raises truepy.License.InvalidPasswordException: if the password is
+            invalid
+        """
+        return self.load(io.BytesIO(data))
+
+    def store(self, license, f):
+        """Stores a license to a stream.
+
+        :param truepy.License license: The license to store.
+
+        :param f: The data stream.
+        :type f: file or stream
+        """
+        license._store(f, self._key, self._iv)
+
+    def dumps(self, license):
+        """Stores a license to a byte string.
+
+        :param truepy.License license: The license to store.
+
+        :return: the encrypted license data
+        :rtype: bytes
+        """
+        f = io.BytesIO()
+        self.store(license, f)
+        return f.getvalue()
@@ -18,25 +18,82 @@
 import base64
 import gzip
 import hashlib
+import hmac
 import io
+import mmap
+import multiprocessing
 import sys
+import zlib
 
 import cryptography.x509
 
 from Crypto.Cipher import DES
 
 from cryptography.hazmat import backends
-from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import dsa, padding, rsa
 
-from . import LicenseData, fromstring
-from ._bean import deserialize, serialize, to_document
+from . import LicenseData
+from ._bean import deserialize, encode_document, write_document
 from ._bean_serializers import bean_class
+from ._cache import LRUCache
 from ._name import Name
+from ._xml import fromstring, parser
+
+
+def _zero_key_iv(cache_key, key_iv):
+    """Overwrites an evicted key and IV with zeroes.
+
+    :param cache_key: The cache key; this is not used.
+
+    :param key_iv: The key and IV buffers.
+    :type key_iv: (bytearray, bytearray)
+    """
+    for buffer in key_iv:
+        buffer[:] = bytearray(len(buffer))
+
+
+def _copy_key_iv(key_iv):
+    """Copies a cached key and IV.
+
+    :param key_iv: The key and IV buffers.
+    :type key_iv: (bytearray, bytearray)
+
+    :return: the key and IV
+    :rtype: (bytes, bytes)
+    """
+    return tuple(bytes(buffer) for buffer in key_iv)
+
+
+class _DecodedLicenseData(object):
+    """A descriptor decoding the license data of a license on first access.
+
+    This is not a property, since all properties of a license are serialised.
+    The decoded value is stored in the slot ``_data``.
+    """
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return instance._data
+        except AttributeError:
+            data = instance._decode()
+            instance._data = data
+            return data
+
+    def __set__(self, instance, value):
+        raise AttributeError('can\'t set attribute')
 
 
 @bean_class('de.schlichtherle.xml.GenericCertificate')
 class License(object):
+    __slots__ = (
+        '_data',
+        '_encoded',
+        '_signature',
+        '_signature_digest',
+        '_signature_encryption')
+
     SIGNATURE_ENCODING = 'US-ASCII/Base64'
 
     _SALT = b'\xCE\xFB\xDE\xAC\x05\x02\x19\x71'
@@ -46,6 +103,41 @@ class License(object):
 
     BLOCK_SIZE = 8
 
+    #: The number of licenses passed to a process at a time by
+    #: :meth:`issue_many`
+    _ISSUE_CHUNK_SIZE = 16
+
+    _GZIP_MAGIC = b'\x1f\x8b'
+
+    #: The cache of derived keys and IVs.
+    #:
+    #: The cache is keyed on the *SHA-256* digest of the password and all key
+    #: derivation parameters.
+    #: Evicted keys and IVs are overwritten with zeroes; set
+    #: ``KEY_IV_CACHE.on_evict`` to ``None`` to disable this, or
+    #: ``KEY_IV_CACHE.size`` to ``0`` to disable caching.
+    KEY_IV_CACHE = LRUCache(32, on_evict=_zero_key_iv)
+
+    #: The cache of parsed certificates and their public keys.
+    #:
+    #: The cache is keyed on the *SHA-256* digest of *PEM* encoded
+    #: certificates passed to :meth:`issue` and :meth:`verify`.
+    CERTIFICATE_CACHE = LRUCache(16)
+
+    #: The cache of issuer names derived from certificate subjects.
+    #:
+    #: The cache is keyed on the certificates passed to :meth:`issue`;
+    #: certificates hash and compare by their *DER* encoding, which is cheaper
+    #: than computing a fingerprint.
+    ISSUER_CACHE = LRUCache(16)
+
+    #: The decoded license data as an instance of
+    #: :class:`~truepy.LicenseData`.
+    #:
+    #: This is decoded from :attr:`encoded` when first accessed; accessing it
+    #: raises :class:`ValueError` if the encoded data is invalid.
+    data = _DecodedLicenseData()
+
     class InvalidSignatureException(Exception):
         """Raised when the signature does not match"""
         pass
@@ -95,16 +187,12 @@ class License(object):
         :param str signature_encoding: The encoding of the signature. This must
             be `US-ASCII/Base64`.
 
-        :raises ValueError: if encoded is not an encoded
-            :class:`~truepy.LicenseData` object, if signature_algorithm is
-            invalid or if signature_encoding is not US-ASCII/Base64
+        The encoded license data is not decoded until :attr:`data` is first
+        accessed, or :meth:`validate` is called.
+
+        :raises ValueError: if signature_algorithm is invalid or if
+            signature_encoding is not US-ASCII/Base64
         """
-        license_data_xml = fromstring(encoded)
-        if license_data_xml.tag != 'java' or len(license_data_xml) != 1:
-            raise ValueError('invalid encoded license data: %s', encoded)
-        #: The decoded license data as an instance of
-        #: :class:`~truepy.LicenseData`
-        self.data = deserialize(license_data_xml[0])
         self._encoded = encoded
 
         self._signature = signature
@@ -117,6 +205,31 @@ class License(object):
                 signature_algorithm)
         self.signature_encoding = signature_encoding
 
+    def validate(self):
+        """Verifies that the encoded license data can be decoded.
+
+        :raises ValueError: if encoded is not an encoded
+            :class:`~truepy.LicenseData` object
+        """
+        self.data
+
+    def _decode(self):
+        """Decodes the encoded license data.
+
+        The encoded license data is parsed on its own rather than while
+        loading the license, since feeding it to a parser from the character
+        data of the license document is slower; see ``benchmarks/load.py``.
+
+        :return: the license data
+
+        :raises ValueError: if encoded is not an encoded
+            :class:`~truepy.LicenseData` object
+        """
+        license_data_xml = fromstring(self._encoded)
+        if license_data_xml.tag != 'java' or len(license_data_xml) != 1:
+            raise ValueError('invalid encoded license data: %s', self._encoded)
+        return deserialize(license_data_xml[0])
+
     @classmethod
     def issue(self, certificate, key, digest='SHA1', **license_data):
         """Issues a new License.
@@ -148,71 +261,188 @@ class License(object):
         else:
             if 'issuer' in license_data:
                 raise ValueError('issuer must not be passed')
-            issuer = Name.from_x509_name(certificate.subject)
-            license_data['issuer'] = str(issuer)
+            license_data['issuer'] = self._issuer(certificate)
             try:
                 license_data = LicenseData(**license_data)
             except TypeError:
                 raise ValueError('invalid keyword arguments')
-        if not isinstance(license_data, LicenseData):
-            raise ValueError('invalid license_data: %s', license_data)
+        return self._sign(key, license_data, digest)
 
+    @classmethod
+    def issue_many(self, certificate, key, license_data, digest='SHA1',
+                   workers=None, password=None, output=None):
+        """Issues several new licenses using a pool of processes.
+
+        The private key is passed to every worker process once, when the pool
+        is created, and not with every license.
+
+        :param certificate: The issuer certificate.
+        :type certificate: bytes or cryptography.x509.Certificate
+
+        :param key: The private key of the certificate.
+
+        :param license_data: The license data to sign.
+        :type license_data: iterable of truepy.LicenseData
+
+        :param str digest: The digest algorithm to use.
+
+        :param int workers: The number of processes to use. If not specified,
+            the number of processor cores is used.
+
+        :param bytes password: The password used by the licensed application.
+            If specified, the worker processes also encrypt the licenses.
+
+        :param callable output: A callable invoked with the index and the new
+            license for every license issued. It must return either a path or
+            a writable stream, to which the license is stored. This requires
+            ``password``.
+
+        :raises ValueError: if ``output`` is passed without ``password``, if
+            the key does not belong to the certificate, or if an item in
+            ``license_data`` is not a license data object
+
+        :return: an iterator over the new licenses, in the same order as
+            ``license_data``
+        """
+        if output is not None and password is None:
+            raise ValueError('output requires a password')
+
+        # Make sure that the key is valid before starting any workers
+        self._encryption(key)
+        public_key = self._certificate_and_key(certificate)[1]
+        if public_key.public_numbers() != key.public_key().public_numbers():
+            raise ValueError('the key does not belong to the certificate')
+
+        key_data = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption())
+        return self._issue_many(key_data, license_data, digest, workers,
+                                password, output)
+
+    @classmethod
+    def _issue_many(self, key_data, license_data, digest, workers, password,
+                    output):
+        """Issues several new licenses using a pool of processes.
+
+        See :meth:`issue_many` for a description of the parameters.
+
+        :param bytes key_data: The unencrypted *PEM* encoded private key.
+
+        :return: an iterator over the new licenses
+        """
+        pool = multiprocessing.Pool(
+            workers,
+            _issue_initialize,
+            (key_data, digest, password))
+        try:
+            for i, (license, data) in enumerate(pool.imap(
+                    _issue, license_data, self._ISSUE_CHUNK_SIZE)):
+                if output is not None:
+                    target = output(i, license)
+                    if hasattr(target, 'write'):
+                        target.write(data)
+                    else:
+                        with open(target, 'wb') as f:
+                            f.write(data)
+                yield license
+        finally:
+            pool.terminate()
+
+    @classmethod
+    def _encryption(self, key):
+        """Returns the name of the encryption algorithm used by a private key.
+
+        :param key: The private key.
+
+        :return: the encryption algorithm name
+        :rtype: str
+
+        :raises ValueError: if the key type is not supported
+        """
         if isinstance(key, rsa.RSAPrivateKey):
-            encryption = 'RSA'
+            return 'RSA'
         elif isinstance(key, dsa.DSAPrivateKey):
-            encryption = 'DSA'
+            return 'DSA'
         else:
             raise ValueError('unknown key type')
 
-        encoded = to_document(serialize(license_data))
-
-        signer = key.signer(
-            padding.PKCS1v15(),
-            getattr(hashes, digest)())
-        signer.update(encoded.encode('ascii'))
-        signature = base64.b64encode(signer.finalize()).decode('ascii')
+    @classmethod
+    def _sign(self, key, license_data, digest):
+        """Signs license data.
 
-        return License(encoded, signature, 'with'.join((digest, encryption)))
+        :param key: The private key of the certificate.
 
-    def _verifier(self, certificate):
-        """Returns a verifier for a certificate.
+        :param truepy.LicenseData license_data: The license data to sign.
 
-        This function will attempt different factory methods, since the
-        argument lists differ.
+        :param str digest: The digest algorithm to use.
 
-        :param cryptography.x509.Certificate certificate: The signer
-            certificate.
+        :raises ValueError: if ``license_data`` is not a license data object
+            or the key type is not supported
 
-        :return: a verifier
+        :return: a new license
+        :rtype: truepy.License
         """
-        public_key = certificate.public_key()
-        try:
-            return public_key.verifier(
-                base64.b64decode(self.signature),
-                padding.PKCS1v15(),
-                getattr(hashes, self._signature_digest)())
-        except TypeError:
-            return public_key.verifier(
-                base64.b64decode(self.signature),
-                getattr(hashes, self._signature_digest)())
+        if not isinstance(license_data, LicenseData):
+            raise ValueError('invalid license_data: %s', license_data)
+
+        encryption = self._encryption(key)
+        encoded = encode_document(license_data)
 
-    def verify(self, certificate):
+        if encryption == 'RSA':
+            signature = key.sign(
+                encoded,
+                padding.PKCS1v15(),
+                getattr(hashes, digest)())
+        else:
+            signature = key.sign(
+                encoded,
+                getattr(hashes, digest)())
+        signature = base64.b64encode(signature).decode('ascii')
+
+        license = License(
+            encoded.decode('ascii'),
+            signature,
+            'with'.join((digest, encryption)))
+        license._data = license_data
+        return license
+
+    def verify(self, certificate, cache=None):
         """Verifies the signature of this certificate against a certificate.
 
+        To verify many licenses against the same certificate, use a
+        :class:`~truepy.Verifier`.
+
         :param certificate: The issuer certificate.
         :type certificate: bytes or cryptography.x509.Certificate
 
+        :param truepy.LRUCache cache: A cache of successful
+            verifications. See :class:`~truepy.Verifier`.
+
         :raises truepy.License.InvalidSignatureException: if the signature does
             not match
         """
-        certificate = self._certificate(certificate)
+        Verifier(certificate, cache).verify(self)
 
-        verifier = self._verifier(certificate)
-        verifier.update(self.encoded.encode('ascii'))
-        try:
-            verifier.verify()
-        except cryptography.exceptions.InvalidSignature as e:
-            raise self.InvalidSignatureException(e)
+    @classmethod
+    def verify_many(self, licenses, certificate, workers=None):
+        """Verifies the signatures of several licenses against a certificate
+        using a pool of threads.
+
+        :param licenses: The licenses to verify.
+        :type licenses: iterable of truepy.License
+
+        :param certificate: The issuer certificate.
+        :type certificate: bytes or cryptography.x509.Certificate
+
+        :param int workers: The number of threads to use. If not specified,
+            the number of processor cores is used.
+
+        :return: an iterator over the verification results, in the same order
+            as ``licenses``; a result is ``None`` if the signature is valid,
+            and otherwise the exception raised by :meth:`verify`
+        """
+        return Verifier(certificate).verify_many(licenses, workers)
 
     @classmethod
     def _certificate(self, certificate):
@@ -225,12 +455,57 @@ class License(object):
 
         :return: a parsed certificate
         """
+        return self._certificate_and_key(certificate)[0]
+
+    @classmethod
+    def _certificate_and_key(self, certificate):
+        """Ensures that a variable is a certificate, and returns it with its
+        public key.
+
+        If ``certificate`` is a *PEM* blob, the parsed certificate and public
+        key are looked up in :attr:`CERTIFICATE_CACHE` by the digest of the
+        blob, and added to the cache if missing.
+
+        :param certificate: The certificate to parse.
+
+        :return: a parsed certificate and its public key
+        """
         if isinstance(certificate, cryptography.x509.Certificate):
-            return certificate
+            return (certificate, certificate.public_key())
         else:
-            return cryptography.x509.load_pem_x509_certificate(
-                certificate,
-                backends.default_backend())
+            return self.CERTIFICATE_CACHE.lookup(
+                hashlib.sha256(certificate).digest(),
+                lambda digest: self._load_certificate(certificate))
+
+    @classmethod
+    def _issuer(self, certificate):
+        """Returns the issuer name of licenses issued with a certificate.
+
+        The name is looked up in :attr:`ISSUER_CACHE` by the certificate, and
+        added to the cache if missing.
+
+        :param cryptography.x509.Certificate certificate: The issuer
+            certificate.
+
+        :return: the string representation of the certificate subject
+        :rtype: str
+        """
+        return self.ISSUER_CACHE.lookup(
+            certificate,
+            lambda certificate: str(Name.from_x509_name(certificate.subject)))
+
+    @classmethod
+    def _load_certificate(self, data):
+        """Parses a *PEM* encoded certificate.
+
+        :param bytes data: The *PEM* blob.
+
+        :return: a parsed certificate and its public key
+        """
+        certificate = cryptography.x509.load_pem_x509_certificate(
+            data,
+            backends.default_backend())
+        return (certificate, certificate.public_key())
 
     @classmethod
     def _key_iv(self, password, salt=_SALT, iterations=_ITERATIONS,
@@ -254,12 +529,22 @@ class License(object):
         :return: the key and IV
         :rtype: (bytes, bytes)
         """
-        # Perform the hashing iterations
-        keyiv = password + salt
-        for i in range(iterations):
-            keyiv = digest(keyiv).digest()
-
-        return (keyiv[:key_size], keyiv[key_size:])
+        def derive(cache_key):
+            # Perform the hashing iterations
+            keyiv = password + salt
+            for i in range(iterations):
+                keyiv = digest(keyiv).digest()
+
+            return (
+                bytearray(keyiv[:key_size]),
+                bytearray(keyiv[key_size:]))
+
+        return self.KEY_IV_CACHE.lookup(
+            (
+                hashlib.sha256(password).digest(),
+                salt, iterations, digest, key_size),
+            derive,
+            _copy_key_iv)
 
     @classmethod
     def _unpad(self, data):
@@ -273,20 +558,119 @@ class License(object):
         :raises truepy.License.InvalidPasswordException: if the padding is
             invalid
         """
-        if sys.version_info.major < 3:
-            padding_length = ord(data[-1])
-            is_valid = all(
-                ord(d) == padding_length
-                for d in data[-padding_length:])
-        else:
-            padding_length = data[-1]
-            is_valid = all(
-                d == padding_length
-                for d in data[-padding_length:])
-        if not is_valid:
+        padding_length = self._check_padding(data[-self.BLOCK_SIZE:])
+        return data[:-padding_length]
+
+    @classmethod
+    def _check_padding(self, block):
+        """Verifies the PKCS#5 1.5 padding of a final block.
+
+        The comparison is performed in constant time with regard to the
+        content of the block.
+
+        :param bytes block: The final, decrypted block.
+
+        :return: the padding length
+        :rtype: int
+
+        :raises truepy.License.InvalidPasswordException: if the padding is
+            invalid
+        """
+        block = bytearray(block)
+        padding_length = block[-1]
+        is_valid = 0 < padding_length <= len(block)
+        expected = block[:len(block) - padding_length] \
+            + bytearray([padding_length]) * padding_length
+        if not hmac.compare_digest(bytes(expected), bytes(block)) \
+                or not is_valid:
             raise self.InvalidPasswordException('invalid PKCS#5 padding')
 
-        return data[:-padding_length]
+        return padding_length
+
+    @classmethod
+    def _check_key(self, head, tail, length, key, iv):
+        """Verifies that a key is likely to decrypt data by decrypting only its
+        first and last blocks.
+
+        The last block is decrypted using the ciphertext block preceding it as
+        IV, and its padding is verified. The first block must begin with the
+        *gzip* magic bytes.
+
+        :param bytes head: The first block of the encrypted data.
+
+        :param bytes tail: The last one or two blocks of the encrypted data.
+            If this is a single block, it must also be the first block.
+
+        :param int length: The total length of the encrypted data.
+
+        :param bytes key: The DES key.
+
+        :param bytes iv: The DES IV.
+
+        :raises ValueError: if the length of the input data is not a multiple
+            of the block size
+        :raises truepy.License.InvalidPasswordException: if the padding or the
+            magic bytes are invalid
+        """
+        if length == 0 or length % self.BLOCK_SIZE != 0:
+            raise ValueError('invalid encrypted data length')
+
+        previous = tail[-2 * self.BLOCK_SIZE:-self.BLOCK_SIZE] \
+            if len(tail) > self.BLOCK_SIZE \
+            else iv
+        self._check_padding(DES.new(
+            key=key,
+            IV=previous,
+            mode=DES.MODE_CBC).decrypt(tail[-self.BLOCK_SIZE:]))
+
+        self._check_magic(DES.new(
+            key=key,
+            IV=iv,
+            mode=DES.MODE_CBC).decrypt(head[:self.BLOCK_SIZE]))
+
+    @classmethod
+    def _check_magic(self, block):
+        """Verifies that a decrypted first block begins with the *gzip* magic
+        bytes.
+
+        :param bytes block: The first, decrypted block.
+
+        :raises truepy.License.InvalidPasswordException: if the magic bytes
+            are invalid
+        """
+        if block[:len(self._GZIP_MAGIC)] != self._GZIP_MAGIC:
+            raise self.InvalidPasswordException('invalid gzip magic bytes')
+
+    @classmethod
+    def _peek(self, f):
+        """Reads the first block and the last two blocks of a seekable stream
+        without changing its position.
+
+        :param f: The data stream.
+        :type f: file or stream
+
+        :return: the tuple ``(head, tail, length)``, where length is the number
+            of bytes remaining in the stream, or ``None`` if the stream is not
+            seekable
+        """
+        try:
+            if not f.seekable():
+                return None
+        except AttributeError:
+            return None
+
+        position = f.tell()
+        f.seek(0, io.SEEK_END)
+        length = f.tell() - position
+        try:
+            f.seek(position)
+            head = f.read(self.BLOCK_SIZE)
+            f.seek(position + max(0, length - 2 * self.BLOCK_SIZE))
+            tail = f.read(2 * self.BLOCK_SIZE)
+        finally:
+            f.seek(position)
+
+        return (head, tail, length)
 
     @classmethod
     def _pad(self, data, block_size=BLOCK_SIZE):
@@ -311,7 +695,7 @@ class License(object):
                 for i in range(block_size - len(data) % block_size))
 
     @classmethod
-    def load(self, f, password):
+    def load(self, f, password, chunk_size=None):
         """Loads a license from a stream.
 
         :param f: The data stream.
@@ -319,6 +703,10 @@ class License(object):
 
         :param bytes password: The password used by the licensed application.
 
+        :param int chunk_size: If specified, the stream is read, decrypted,
+            decompressed and parsed incrementally, this many bytes at a time.
+            Otherwise the entire stream is read at once.
+
         :return: a license object
         :rtype: truepy.License
 
@@ -326,25 +714,279 @@ class License(object):
         :raises truepy.License.InvalidPasswordException: if the password is
             invalid
         """
+        return self._load(f, *self._key_iv(password), chunk_size=chunk_size)
+
+    @classmethod
+    def load_any(self, f, passwords):
+        """Loads a license from a stream encrypted with any one of several
+        passwords.
+
+        The stream is read once. The key for each password is taken from
+        :attr:`KEY_IV_CACHE` or derived when needed, and candidates are
+        rejected by decrypting only the first and last blocks. Passwords are
+        tried in order, and no keys are derived for passwords following the
+        matching one.
+
+        :param f: The data stream.
+        :type f: file or stream
+
+        :param passwords: The passwords to try.
+        :type passwords: iterable of bytes
+
+        :return: the tuple ``(license, password)``
+        :rtype: (truepy.License, bytes)
+
+        :raises ValueError: if the input data is invalid
+        :raises truepy.License.InvalidPasswordException: if none of the
+            passwords is valid
+        """
+        data = f.read()
+        head = data[:self.BLOCK_SIZE]
+        tail = data[-2 * self.BLOCK_SIZE:]
+        for password in passwords:
+            key, iv = self._key_iv(password)
+            try:
+                self._check_key(head, tail, len(data), key, iv)
+                return (self._load(io.BytesIO(data), key, iv), password)
+            except self.InvalidPasswordException:
+                continue
+
+        raise self.InvalidPasswordException('no valid password')
+
+    @classmethod
+    def load_path(self, path, password):
+        """Loads a license from a file.
+
+        The file is memory mapped and decrypted into a single preallocated
+        buffer, and the padding is removed without copying the decrypted data.
+
+        :param str path: The path of the license file.
+
+        :param bytes password: The password used by the licensed application.
+
+        :return: a license object
+        :rtype: truepy.License
+
+        :raises ValueError: if the file data is invalid
+        :raises truepy.License.InvalidPasswordException: if the password is
+            invalid
+        """
+        return self._load_path(path, *self._key_iv(password))
+
+    @classmethod
+    def _load_path(self, path, key, iv):
+        """Loads a license from a file using an already derived key.
+
+        :param str path: The path of the license file.
+
+        :param bytes key: The DES key.
+
+        :param bytes iv: The DES IV.
+
+        :return: a license object
+        :rtype: truepy.License
+
+        :raises ValueError: if the file data is invalid
+        :raises truepy.License.InvalidPasswordException: if the key is invalid
+        """
+        with open(path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                raise ValueError('invalid encrypted data length')
+        try:
+            with memoryview(mapped) as data:
+                return self._load_buffer(data, key, iv)
+        finally:
+            mapped.close()
+
+    @classmethod
+    def _load_buffer(self, data, key, iv):
+        """Loads a license from a buffer.
+
+        The buffer is decrypted into a single preallocated buffer, which is
+        then decompressed and parsed through a memory view.
+
+        :param memoryview data: The encrypted data.
+
+        :param bytes key: The DES key.
+
+        :param bytes iv: The DES IV.
+
+        :return: a license object
+        :rtype: truepy.License
+
+        :raises ValueError: if the input data is invalid
+        :raises truepy.License.InvalidPasswordException: if the key is invalid
+        """
+        length = len(data)
+        self._check_key(
+            bytes(data[:self.BLOCK_SIZE]),
+            bytes(data[-2 * self.BLOCK_SIZE:]),
+            length,
+            key,
+            iv)
+
+        decrypted = bytearray(length)
+        DES.new(
+            key=key,
+            IV=iv,
+            mode=DES.MODE_CBC).decrypt(data, output=decrypted)
+        padding_length = self._check_padding(
+            decrypted[-self.BLOCK_SIZE:])
+
+        with memoryview(decrypted) as view:
+            return self._deserialize(self._parse(
+                self._inflate((view[:length - padding_length],))))
+
+    @classmethod
+    def _load(self, f, key, iv, chunk_size=None):
+        """Loads a license from a stream using an already derived key.
+
+        :param f: The data stream.
+        :type f: file or stream
+
+        :param bytes key: The DES key.
+
+        :param bytes iv: The DES IV.
+
+        :param int chunk_size: The number of bytes to read at a time, or
+            ``None`` to read the entire stream at once.
+
+        :return: a license object
+        :rtype: truepy.License
+
+        :raises ValueError: if the input data is invalid
+        :raises truepy.License.InvalidPasswordException: if the key is invalid
+        """
+        return self._deserialize(self._parse(
+            self._inflate(self._decrypt(f, key, iv, chunk_size))))
+
+    @classmethod
+    def _decrypt(self, f, key, iv, chunk_size=None):
+        """Decrypts a stream.
+
+        The last block is not decrypted until the end of the stream has been
+        reached, since it contains the padding.
+
+        :param f: The data stream.
+        :type f: file or stream
+
+        :param bytes key: The DES key.
+
+        :param bytes iv: The DES IV.
+
+        :param int chunk_size: The number of bytes to read at a time, or
+            ``None`` to read the entire stream at once.
+
+        :return: an iterator over unpadded, decrypted data
+
+        :raises ValueError: if the length of the input data is not a multiple
+            of the block size
+        :raises truepy.License.InvalidPasswordException: if the padding is
+            invalid
+        """
+        # Verify the key against the first and last blocks before decrypting
+        # the bulk of the data, if they can be read up front
+        if chunk_size is None:
+            data = f.read()
+            self._check_key(data, data[-2 * self.BLOCK_SIZE:], len(data),
+                            key, iv)
+            chunks = iter((data,))
+        else:
+            peeked = self._peek(f)
+            if peeked is not None:
+                self._check_key(*peeked, key=key, iv=iv)
+            chunks = iter(lambda: f.read(chunk_size), b'')
+
         # Initialise cryptography
-        key, iv = self._key_iv(password)
         des = DES.new(
             key=key,
             IV=iv,
             mode=DES.MODE_CBC)
 
-        # Decrypt the input stream
-        encrypted_data = f.read()
-        decrypted_data = self._unpad(des.decrypt(encrypted_data))
+        buffered = b''
+        checked = False
+        for chunk in chunks:
+            buffered += chunk
+
+            # Verify the magic bytes of the first block before decrypting the
+            # remainder of the chunk, since the key was not necessarily checked
+            # above
+            if not checked and len(buffered) > self.BLOCK_SIZE:
+                head = des.decrypt(buffered[:self.BLOCK_SIZE])
+                self._check_magic(head)
+                checked = True
+                yield head
+                buffered = buffered[self.BLOCK_SIZE:]
+
+            # Decrypt all complete blocks but the last one
+            length = (len(buffered) - 1) // self.BLOCK_SIZE * self.BLOCK_SIZE
+            if length > 0:
+                yield des.decrypt(buffered[:length])
+                buffered = buffered[length:]
+
+        if len(buffered) != self.BLOCK_SIZE:
+            raise ValueError('invalid encrypted data length')
+        yield self._unpad(des.decrypt(buffered))
+
+    @classmethod
+    def _inflate(self, chunks):
+        """Decompresses *gzip* compressed data.
+
+        :param chunks: The compressed data.
+        :type chunks: iterator of bytes
+
+        :return: an iterator over decompressed data
+
+        :raises ValueError: if the data is truncated
+        :raises truepy.License.InvalidPasswordException: if the data is not
+            valid *gzip* data; when streaming, this may be detected before the
+            padding has been checked
+        """
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            for chunk in chunks:
+                yield decompressor.decompress(chunk)
+            yield decompressor.flush()
+        except zlib.error as e:
+            raise self.InvalidPasswordException(
+                'invalid compressed data: %s', e)
+        if not decompressor.eof:
+            raise ValueError('truncated compressed data')
+
+    @classmethod
+    def _parse(self, chunks):
+        """Parses an XML document.
+
+        :param chunks: The XML data.
+        :type chunks: iterator of bytes
+
+        :return: the root element
+        """
+        xml_parser = parser()
+        for chunk in chunks:
+            xml_parser.feed(chunk)
+        return xml_parser.close()
+
+    @classmethod
+    def _deserialize(self, element):
+        """Deserialises a license document.
+
+        :param element: The root element of the document.
 
-        # Decompress and parse the XML
-        decrypted_stream = io.BytesIO(decrypted_data)
-        with gzip.GzipFile(fileobj=decrypted_stream, mode='r') as gz:
-            xml_data = gz.read()
+        :return: a license object
+        :rtype: truepy.License
 
-        # Use the first child of the top-level java element
-        element = fromstring(xml_data)[0]
-        return deserialize(element)
+        :raises ValueError: if the document does not contain a license
+        """
+        if element.tag != 'java' or len(element) != 1:
+            raise ValueError('invalid license document')
+        license = deserialize(element[0])
+        if not isinstance(license, self):
+            raise ValueError('invalid license document')
+        return license
 
     def store(self, f, password):
         """Stores this license to a stream.
@@ -354,23 +996,112 @@ class License(object):
 
         :param bytes password: The password used by the licensed application.
         """
-        # Initialise cryptography
-        key, iv = self._key_iv(password)
-        des = DES.new(
+        self._store(f, *self._key_iv(password))
+
+    def _store(self, f, key, iv):
+        """Stores this license to a stream using an already derived key.
+
+        :param f: The data stream.
+        :type f: file or stream
+
+        :param bytes key: The DES key.
+
+        :param bytes iv: The DES IV.
+        """
+        # Serialise the license and compress the XML; the encrypted data is
+        # written to the output stream as soon as complete blocks are
+        # available
+        encrypter = _Encrypter(f, key, iv, self._pad)
+        with gzip.GzipFile(fileobj=encrypter, mode='wb') as gz:
+            write_document(self, gz)
+        encrypter.close()
+
+
+class _Encrypter(object):
+    def __init__(self, f, key, iv, pad, block_size=License.BLOCK_SIZE):
+        """A write-only stream encrypting all data written to it.
+
+        Complete blocks are encrypted and written to the underlying stream as
+        soon as they are available. The final block is padded and written
+        when the stream is closed.
+
+        :param f: The underlying data stream.
+        :type f: file or stream
+
+        :param bytes key: The DES key.
+
+        :param bytes iv: The DES IV.
+
+        :param callable pad: The function used to pad the final block.
+
+        :param int block_size: The encryption block size.
+        """
+        self._f = f
+        self._des = DES.new(
             key=key,
             IV=iv,
             mode=DES.MODE_CBC)
+        self._pad = pad
+        self._block_size = block_size
+        self._buffered = b''
+
+    def write(self, data):
+        self._buffered += data
+        length = len(self._buffered) // self._block_size * self._block_size
+        if length > 0:
+            self._f.write(self._des.encrypt(self._buffered[:length]))
+            self._buffered = self._buffered[length:]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._f.write(self._des.encrypt(self._pad(self._buffered)))
+        self._buffered = b''
+
+
+#: The private key, digest and codec used by worker processes started by
+#: :meth:`License.issue_many`
+_issue_state = {}
+
+
+def _issue_initialize(key_data, digest, password):
+    """Initialises a worker process started by :meth:`License.issue_many`.
+
+    :param bytes key_data: The unencrypted *PEM* encoded private key.
+
+    :param str digest: The digest algorithm to use.
+
+    :param bytes password: The password used to encrypt licenses, or ``None``.
+    """
+    _issue_state['key'] = serialization.load_pem_private_key(
+        key_data,
+        password=None,
+        backend=backends.default_backend())
+    _issue_state['digest'] = digest
+    _issue_state['codec'] = LicenseCodec(password) \
+        if password is not None \
+        else None
+
+
+def _issue(license_data):
+    """Issues a license in a worker process started by
+    :meth:`License.issue_many`.
+
+    :param truepy.LicenseData license_data: The license data to sign.
 
-        # Serialize the license
-        xml_data = to_document(serialize(self)) if sys.version_info.major < 3 \
-            else bytes(to_document(serialize(self)), 'ascii')
+    :return: the new license, and the encrypted license if a password was
+        passed
+    :rtype: (truepy.License, bytes or None)
+    """
+    license = License._sign(
+        _issue_state['key'],
+        license_data,
+        _issue_state['digest'])
+    codec = _issue_state['codec']
+    return (license, codec.dumps(license) if codec is not None else None)
 
-        # Compress the XML
-        compressed_stream = io.BytesIO()
-        with gzip.GzipFile(fileobj=compressed_stream, mode='w') as gz:
-            gz.write(xml_data)
-        compressed_data = compressed_stream.getvalue()
 
-        # Encrypt the data and write it to the output stream
-        encrypted_data = des.encrypt(self._pad(compressed_data))
-        f.write(encrypted_data)
+from ._codec import LicenseCodec
+from ._verifier import Verifier
@@ -19,16 +19,94 @@ import json
 
 from datetime import datetime
 
+from ._bean import UnknownFragmentException, deserialize, _serialization_plan
 from ._name import Name
-from ._bean_serializers import bean_class
+from ._bean_serializers import bean_class, datetime_deserializer, \
+    default_bean_deserialize, str_deserializer
+from ._timestamp import FORMAT, parse as parse_timestamp, to_milliseconds
+
+
+def _name_deserializer(element):
+    """Deserialises a *javax.security.auth.x500.X500Principal* to its string
+    representation.
+
+    :param element: The XML fragment to deserialise.
+
+    :raises truepy._bean.UnknownFragmentException: if the fragment is not a
+        name with a single string
+    """
+    if element.tag != 'object' \
+            or element.get('class') != Name.bean_class \
+            or len(element) != 1:
+        raise UnknownFragmentException()
+    return str_deserializer(element[0])
+
+
+def _json_value(value):
+    """Converts a value to a value that can be JSON serialised.
+
+    Timestamps are converted to milliseconds since the epoch, names to their
+    string representation and beans to mappings from property name to value.
+
+    :param value: The value to convert.
+
+    :return: the converted value
+
+    :raises ValueError: if a mapping key is converted to a collection
+    """
+    if isinstance(value, datetime):
+        return to_milliseconds(value)
+    elif isinstance(value, Name):
+        return str(value)
+    elif isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            key = _json_value(key)
+            if isinstance(key, (dict, list)):
+                raise ValueError('invalid mapping key: %s', key)
+            result[key] = _json_value(item)
+        return result
+    elif isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    elif hasattr(value, 'bean_class'):
+        class_name, plan = _serialization_plan(value)
+        return {
+            property_name: _json_value(getter(value))
+            for getter, property_name in plan}
+    else:
+        return value
 
 
 @bean_class('de.schlichtherle.license.LicenseContent')
 class LicenseData(object):
-    TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+    __slots__ = (
+        '_not_before',
+        '_not_after',
+        '_issued',
+        '_issuer',
+        '_holder',
+        '_subject',
+        '_consumer_type',
+        '_info',
+        '_extra')
+
+    TIMESTAMP_FORMAT = FORMAT
 
     UNKNOWN_NAME = 'CN=Unknown'
 
+    #: A mapping from property name to constructor argument and deserialiser,
+    #: used when deserialising license data
+    _PROPERTIES = {
+        'notBefore': ('not_before', datetime_deserializer),
+        'notAfter': ('not_after', datetime_deserializer),
+        'issued': ('issued', datetime_deserializer),
+        'issuer': ('issuer', _name_deserializer),
+        'holder': ('holder', _name_deserializer),
+        'subject': ('subject', str_deserializer),
+        'consumerType': ('consumer_type', str_deserializer),
+        'info': ('info', str_deserializer),
+        'extra': ('extra', deserialize)}
+
     @property
     def not_before(self):
         """The notBefore timestamp of this license"""
@@ -74,25 +152,55 @@ class LicenseData(object):
         """The license extra data"""
         return self._extra
 
+    @classmethod
+    def _bean_deserialize(self, element):
+        """Deserialises a *LicenseContent* XML fragment.
+
+        The known properties are read in a single pass over the children of
+        the fragment. A fragment with any other shape is passed on to
+        :func:`~truepy._bean_serializers.default_bean_deserialize`.
+
+        :param element: The XML fragment to deserialise.
+
+        :return: license data
+        :rtype: truepy.LicenseData
+
+        :raises ValueError: if the fragment does not contain the
+            ``notBefore`` and ``notAfter`` properties
+        """
+        properties = {}
+        try:
+            for e in element:
+                name, deserializer = self._PROPERTIES[e.get('property')]
+                if e.tag != 'void' or len(e) != 1:
+                    raise UnknownFragmentException()
+                properties[name] = deserializer(e[0])
+        except (KeyError, UnknownFragmentException):
+            return default_bean_deserialize(self, element)
+
+        if 'not_before' not in properties or 'not_after' not in properties:
+            raise ValueError('notBefore and notAfter are required')
+        return self(**properties)
+
     def __init__(self, not_before, not_after, issued=None, issuer=None,
                  holder=None, subject=None, consumer_type=None, info=None,
                  extra=None):
         """A class representing a license with a validity window and meta data.
 
-        Any timestamps passed must be either instances of datetime.datetime, or
-        strings parsable by License.TIMESTAMP_FORMAT; the timezone is assumed
-        to be UTC.
+        Any timestamps passed must be either instances of datetime.datetime,
+        strings parsable by License.TIMESTAMP_FORMAT or integer numbers of
+        milliseconds since the epoch; the timezone is assumed to be UTC.
 
         :param not_before: The timestamp when this license starts to be valid.
-        :type not_before: datetime.datetime or str
+        :type not_before: datetime.datetime or str or int
 
         :param not_after: The timestamp when this license ceases to be valid.
             This must be strictly after `not_before`.
-        :type not_after: datetime.datetime or str
+        :type not_after: datetime.datetime or str or int
 
         :param issued: The timestamp when this license was issued. This
             defaults to not_before.
-        :type issued: datetime.datetime or str
+        :type issued: datetime.datetime or str or int
 
         :param issuer: The issuer of this certificate. If not specified,
             UNKNOWN_NAME will be used.
@@ -112,24 +220,19 @@ class LicenseData(object):
             This value will be stringified.
 
         :param object extra: Any type of data to store in the license. If this
-            is not a string, it will be JSON serialised.
+            is not a string, it will be JSON serialised; timestamps are stored
+            as milliseconds since the epoch, and beans as mappings from
+            property name to value.
         """
-        def timestamp(v):
-            if isinstance(v, datetime):
-                return v
-            else:
-                return datetime.strptime(
-                    v + ' UTC',
-                    self.TIMESTAMP_FORMAT + ' %Z')
-
-        self._not_before = timestamp(not_before)
-        self._not_after = timestamp(not_after)
+        self._not_before = parse_timestamp(not_before)
+        self._not_after = parse_timestamp(not_after)
         if self._not_before >= self._not_after:
             raise ValueError(
                 '%s is not before %s',
                 self._not_before,
                 self._not_after)
-        self._issued = timestamp(issued or not_before)
+        self._issued = parse_timestamp(
+            issued if issued is not None else not_before)
 
         self._issuer = Name(str(issuer or self.UNKNOWN_NAME))
         self._holder = Name(str(holder or self.UNKNOWN_NAME))
@@ -139,6 +242,6 @@ class LicenseData(object):
         self._info = str(info or '')
 
         if not isinstance(extra, str):
-            self._extra = json.dumps(extra)
+            self._extra = json.dumps(_json_value(extra))
         else:
             self._extra = extra
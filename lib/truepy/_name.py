@@ -18,12 +18,21 @@
 import cryptography.x509
 import re
 
-from ._bean import bean_serializer, value_to_xml
+try:
+    from sys import intern
+except ImportError:
+    # Python 2 provides intern as a builtin
+    pass
+
+from ._bean import bean_emitter, bean_serializer, value_to_text, value_to_xml
 from ._bean_serializers import bean_class
+from ._cache import LRUCache
 
 
 @bean_class('javax.security.auth.x500.X500Principal')
-class Name(list):
+class Name(tuple):
+    __slots__ = ()
+
     #: The escapable characters
     ESCAPABLES = ('"', '+', ',', ';', '<', '>')
 
@@ -45,9 +54,12 @@ class Name(list):
 
     SUB_RE = re.compile(r'\#([0-9a-fA-F]{2})')
 
+    #: The cache of names parsed from strings
+    CACHE = LRUCache(256)
+
     @classmethod
     def _bean_deserialize(self, element):
-        return self(element.find('.//string').text)
+        return self(element.find('string').text)
 
     @classmethod
     def escape(self, s):
@@ -83,7 +95,7 @@ class Name(list):
 
         return self.SUB_RE.sub(replacer, s)
 
-    def __init__(self, name):
+    def __new__(self, name):
         """A class representing a simplified version of an X500 name.
 
         The string must be on the form
@@ -95,24 +107,64 @@ class Name(list):
 
         Leading and trailing space is stripped for the value.
 
+        Names are immutable sequences of the tuple ``(type, value)``, and
+        ``type`` is interned. A name compares equal to a list of the same
+        tuples.
+
+        Names created from strings are cached in :attr:`CACHE`, so creating a
+        name from the same string again returns the same instance.
+
         :param name: The *X.509* name string from which to create this
-            instance. This may also be a list of the tuple ``(type, value)``.
-        :type name: str or list
+            instance. This may also be a sequence of the tuple
+            ``(type, value)``.
+        :type name: str or list or tuple
 
         :raises ValueError: if any part contains an invalid escape sequence, or
             any part does not contain an ``'='``
         """
-        if isinstance(name, list):
-            self.extend(name)
+        if isinstance(name, (list, tuple)):
+            return tuple.__new__(self, (
+                (intern(str(k)), v)
+                for (k, v) in name))
         else:
-            try:
-                self.extend(
-                    (
-                        kv.split('=')[0].strip(),
-                        self.unescape(kv.split('=')[1].strip()))
-                    for kv in name.split(','))
-            except IndexError:
+            return self.CACHE.lookup((self, name), self._parse)
+
+    @classmethod
+    def _parse(self, key):
+        """Parses a name string.
+
+        Every component is split once, and only values containing escape
+        sequences are unescaped.
+
+        :param key: The tuple ``(class, name)``.
+
+        :return: a new name
+        :rtype: truepy.Name
+
+        :raises ValueError: if any part contains an invalid escape sequence, or
+            any part does not contain an ``'='``
+        """
+        cls, name = key
+        parts = []
+        for kv in name.split(','):
+            k, separator, v = kv.partition('=')
+            if not separator:
                 raise ValueError('invalid X509 name: %s', name)
+            v = v.strip()
+            if '#' in v:
+                v = self.unescape(v)
+            parts.append((intern(k.strip()), v))
+        return tuple.__new__(cls, parts)
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            other = tuple(other)
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = tuple.__hash__
 
     def __str__(self):
         return ','.join(
@@ -136,3 +188,11 @@ def name_serializer(v):
     javax.security.auth.x500.X500Principal"""
     return value_to_xml(
         str(v), 'string', Name.bean_class)
+
+
+@bean_emitter(Name)
+def name_emitter(v):
+    """Emits a truepy.Name instance as a
+    javax.security.auth.x500.X500Principal"""
+    return value_to_text(
+        str(v), 'string', Name.bean_class)
@@ -0,0 +1,87 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime, timedelta
+
+
+#: The epoch of *java.util.Date*; all timestamps are in UTC
+EPOCH = datetime(1970, 1, 1)
+
+#: The format of timestamp strings
+FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def to_milliseconds(value):
+    """Converts a timestamp to milliseconds since the epoch.
+
+    Sub-millisecond precision is truncated towards zero.
+
+    :param datetime.datetime value: The timestamp.
+
+    :return: the number of milliseconds since the epoch
+    :rtype: int
+    """
+    delta = value - EPOCH
+    microseconds = (delta.days * 86400 + delta.seconds) * 1000000 \
+        + delta.microseconds
+    if microseconds < 0:
+        return -(-microseconds // 1000)
+    else:
+        return microseconds // 1000
+
+
+def from_milliseconds(value):
+    """Converts milliseconds since the epoch to a timestamp.
+
+    :param int value: The number of milliseconds since the epoch.
+
+    :return: a timestamp
+    :rtype: datetime.datetime
+    """
+    return EPOCH + timedelta(milliseconds=value)
+
+
+def parse(value):
+    """Parses a timestamp.
+
+    Strings on the exact form ``YYYY-MM-DDTHH:MM:SS`` are parsed directly; all
+    other strings are parsed with :attr:`FORMAT` by
+    :meth:`datetime.datetime.strptime`.
+
+    :param value: The timestamp. This may be a string, an instance of
+        :class:`datetime.datetime`, which is returned unchanged, or an integer
+        number of milliseconds since the epoch.
+    :type value: str or datetime.datetime or int
+
+    :return: a timestamp
+    :rtype: datetime.datetime
+
+    :raises ValueError: if value is an invalid string
+    """
+    if isinstance(value, datetime):
+        return value
+    elif isinstance(value, int) and not isinstance(value, bool):
+        return from_milliseconds(value)
+    elif len(value) == 19 and value[4] == '-' and value[7] == '-' \
+            and value[10] == 'T' and value[13] == ':' and value[16] == ':' \
+            and (value[:4] + value[5:7] + value[8:10] + value[11:13]
+                 + value[14:16] + value[17:]).isdigit():
+        return datetime(
+            int(value[:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:]))
+    else:
+        return datetime.strptime(value, FORMAT)
@@ -0,0 +1,187 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import base64
+import binascii
+import hashlib
+
+from multiprocessing.pool import ThreadPool
+
+import cryptography.exceptions
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import dsa, padding, rsa
+
+from ._license import License
+
+
+class Verifier(object):
+    #: The number of licenses passed to a thread at a time by
+    #: :meth:`verify_many`
+    _CHUNK_SIZE = 8
+
+    @property
+    def certificate(self):
+        """The issuer certificate"""
+        return self._certificate
+
+    def __init__(self, certificate, cache=None):
+        """A class verifying license signatures against a single certificate.
+
+        The public key, the padding and the digest algorithms are resolved
+        once, so verifying many licenses against the same certificate does not
+        pay for this on every call.
+
+        If ``cache`` is specified, successful verifications are remembered in
+        it, keyed on the signature, the digest of the encoded license data,
+        the certificate fingerprint and the signature algorithm. Failed
+        verifications are never cached. The same cache may be shared by
+        several verifiers.
+
+        :param certificate: The issuer certificate.
+        :type certificate: bytes or cryptography.x509.Certificate
+
+        :param truepy.LRUCache cache: A cache of successful
+            verifications.
+
+        :raises ValueError: if the certificate key type is not supported
+        """
+        self._certificate, public_key = License._certificate_and_key(
+            certificate)
+
+        self._cache = cache
+        if cache is not None:
+            self._fingerprint = self._certificate.fingerprint(hashes.SHA256())
+
+        if isinstance(public_key, rsa.RSAPublicKey):
+            pkcs1v15 = padding.PKCS1v15()
+            self._verify = lambda signature, data, digest: public_key.verify(
+                signature, data, pkcs1v15, digest)
+            self._encryption = 'RSA'
+        elif isinstance(public_key, dsa.DSAPublicKey):
+            self._verify = public_key.verify
+            self._encryption = 'DSA'
+        else:
+            raise ValueError('unknown key type')
+
+        self._digests = {}
+
+    def verify(self, license):
+        """Verifies the signature of a license.
+
+        :param truepy.License license: The license to verify.
+
+        :raises truepy.License.InvalidSignatureException: if the signature does
+            not match, or if the signature encryption algorithm does not match
+            the certificate key
+        :raises ValueError: if the signature digest algorithm is not supported
+        """
+        if license._signature_encryption.upper() != self._encryption:
+            raise License.InvalidSignatureException(
+                'signature encryption algorithm does not match key: %s',
+                license._signature_encryption)
+
+        if self._cache is not None:
+            cache_key = (
+                license.signature,
+                hashlib.sha256(license.encoded.encode('ascii')).digest(),
+                self._fingerprint,
+                license.signature_algorithm)
+            if self._cache.get(cache_key, False):
+                return
+
+        try:
+            signature = base64.b64decode(license.signature)
+        except (binascii.Error, TypeError) as e:
+            raise License.InvalidSignatureException(e)
+
+        try:
+            self._verify(
+                signature,
+                license.encoded.encode('ascii'),
+                self._digest(license._signature_digest))
+        except cryptography.exceptions.InvalidSignature as e:
+            raise License.InvalidSignatureException(e)
+
+        if self._cache is not None:
+            self._cache.put(cache_key, True)
+
+    def is_valid(self, license):
+        """Returns whether the signature of a license is valid.
+
+        :param truepy.License license: The license to verify.
+
+        :return: whether the signature matches
+        :rtype: bool
+
+        :raises ValueError: if the signature digest algorithm is not supported
+        """
+        try:
+            self.verify(license)
+            return True
+        except License.InvalidSignatureException:
+            return False
+
+    def verify_many(self, licenses, workers=None):
+        """Verifies the signatures of several licenses using a pool of
+        threads.
+
+        The signature verification releases the global interpreter lock, so
+        this scales with the number of processor cores.
+
+        :param licenses: The licenses to verify.
+        :type licenses: iterable of truepy.License
+
+        :param int workers: The number of threads to use. If not specified,
+            the number of processor cores is used.
+
+        :return: an iterator over the verification results, in the same order
+            as ``licenses``; a result is ``None`` if the signature is valid,
+            and otherwise the exception raised by :meth:`verify`
+        """
+        def verify(license):
+            try:
+                self.verify(license)
+                return None
+            except (License.InvalidSignatureException, ValueError) as e:
+                return e
+
+        pool = ThreadPool(workers)
+        try:
+            for result in pool.imap(verify, licenses, self._CHUNK_SIZE):
+                yield result
+        finally:
+            pool.terminate()
+
+    def _digest(self, name):
+        """Returns a digest algorithm instance.
+
+        :param str name: The name of the digest algorithm, such as ``'SHA1'``.
+
+        :return: a digest algorithm instance
+
+        :raises ValueError: if the digest algorithm is not supported
+        """
+        try:
+            return self._digests[name]
+        except KeyError:
+            try:
+                digest = getattr(hashes, name)()
+            except (AttributeError, TypeError):
+                raise ValueError('unknown digest algorithm: %s', name)
+            self._digests[name] = digest
+            return digest
@@ -0,0 +1,192 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+
+from xml.etree import ElementTree
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+#: The name of the environment variable used to select the XML backend when
+#: this module is imported
+ENVIRONMENT_VARIABLE = 'TRUEPY_XML_BACKEND'
+
+
+class _StdlibBackend(object):
+    """The XML backend using :mod:`xml.etree.ElementTree`.
+    """
+    name = 'stdlib'
+
+    Element = staticmethod(ElementTree.Element)
+    SubElement = staticmethod(ElementTree.SubElement)
+    fromstring = staticmethod(ElementTree.fromstring)
+
+    parser = staticmethod(ElementTree.XMLParser)
+
+
+class _LxmlBackend(object):
+    """The XML backend using *lxml*.
+
+    Comments and processing instructions are dropped, and entities are not
+    resolved, to match the standard library parser.
+    """
+    name = 'lxml'
+
+    def __init__(self):
+        self.Element = etree.Element
+        self.SubElement = etree.SubElement
+        self._parser = etree.XMLParser(
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False)
+
+        # lxml refuses to parse strings containing an encoding declaration,
+        # so strings are parsed as UTF-8 regardless of the declaration
+        self._text_parser = etree.XMLParser(
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False,
+            encoding='utf-8')
+
+    def fromstring(self, text):
+        if isinstance(text, bytes):
+            return etree.fromstring(text, self._parser)
+        else:
+            return etree.fromstring(text.encode('utf-8'), self._text_parser)
+
+    def parser(self):
+        return etree.XMLParser(
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False)
+
+
+#: The names of all known backends
+BACKENDS = ('lxml', 'stdlib')
+
+#: The current backend
+_backend = None
+
+
+def get_xml_backend():
+    """Returns the name of the XML backend in use.
+
+    :return: ``'lxml'`` or ``'stdlib'``
+    :rtype: str
+    """
+    return _backend.name
+
+
+def set_xml_backend(name='stdlib'):
+    """Selects the XML backend used to parse documents and build elements.
+
+    The initial backend is read from the environment variable
+    ``TRUEPY_XML_BACKEND``, and defaults to ``'stdlib'``.
+
+    The *lxml* backend must be selected explicitly, since it raises
+    :class:`lxml.etree.XMLSyntaxError` rather than
+    :class:`xml.etree.ElementTree.ParseError` for invalid documents, and
+    leaves entity references other than the predefined ones unresolved.
+
+    Serialised documents are identical for all backends, since they are
+    signed.
+
+    :param str name: The name of the backend; one of ``'lxml'``, ``'stdlib'``
+        and ``'auto'``. ``'auto'`` selects *lxml* if it is installed.
+
+    :raises ValueError: if the backend is unknown or not available
+    """
+    global _backend
+    if name == 'auto':
+        name = 'lxml' if etree is not None else 'stdlib'
+    if name == 'lxml':
+        if etree is None:
+            raise ValueError('XML backend not available: %s', name)
+        _backend = _LxmlBackend()
+    elif name == 'stdlib':
+        _backend = _StdlibBackend()
+    else:
+        raise ValueError('unknown XML backend: %s', name)
+
+
+def Element(tag, attrib={}):
+    """Creates an element using the current backend.
+
+    :param str tag: The element tag.
+
+    :param dict attrib: The element attributes.
+    """
+    return _backend.Element(tag, attrib=attrib)
+
+
+def SubElement(parent, tag, attrib={}):
+    """Creates an element using the current backend and appends it to a
+    parent.
+
+    :param parent: The parent element.
+
+    :param str tag: The element tag.
+
+    :param dict attrib: The element attributes.
+    """
+    return _backend.SubElement(parent, tag, attrib=attrib)
+
+
+def fromstring(text):
+    """Parses an XML document using the current backend.
+
+    :param text: The document.
+    :type text: str or bytes
+
+    :return: the root element
+    """
+    return _backend.fromstring(text)
+
+
+def parser():
+    """Creates an incremental parser using the current backend.
+
+    The parser has the ``feed`` and ``close`` methods of
+    :class:`xml.etree.ElementTree.XMLParser`; ``close`` returns the root
+    element.
+    """
+    return _backend.parser()
+
+
+if sys.version_info.major > 2:
+    def tostring(e):
+        """Serialises an element to text.
+
+        The standard library serialiser is used for all backends, so the text
+        does not depend on the backend.
+
+        :param e: The element to serialise.
+
+        :return: the US-ASCII text
+        :rtype: str
+        """
+        return str(ElementTree.tostring(e), 'ascii')
+else:
+    tostring = ElementTree.tostring
+
+
+set_xml_backend(os.environ.get(ENVIRONMENT_VARIABLE, 'stdlib'))
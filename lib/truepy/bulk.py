@@ -0,0 +1,180 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import glob
+import itertools
+import os
+
+import cryptography.x509
+
+from cryptography.hazmat.primitives import serialization
+
+from ._license import License
+from ._verifier import Verifier
+from ._xml import get_xml_backend, set_xml_backend
+
+
+#: The number of files loaded by a worker process per task
+_CHUNK_SIZE = 16
+
+#: The number of tasks per worker process that may be pending at any time
+_TASKS_PER_WORKER = 2
+
+#: The key, IV and verifier used by worker processes started by
+#: :func:`load_directory`
+_state = {}
+
+
+def load_directory(path, password, certificate=None, workers=None,
+                   pattern='*.lic'):
+    """Loads, and optionally verifies, all license files in a directory using
+    a pool of processes.
+
+    The key is derived once, and passed to every worker process when the pool
+    is created along with the name of the current XML backend. Only a bounded
+    number of files are being loaded at any time, so the memory used does not
+    grow with the number of files.
+
+    Errors are reported per file and do not stop the iteration.
+
+    :param str path: The directory containing the license files.
+
+    :param bytes password: The password used by the licensed application.
+
+    :param certificate: The issuer certificate. If specified, the signature
+        of every license is verified.
+    :type certificate: bytes or cryptography.x509.Certificate
+
+    :param int workers: The number of processes to use. If not specified,
+        the number of processor cores is used.
+
+    :param str pattern: The glob pattern of the file names to load.
+
+    :raises ValueError: if ``workers`` is less than ``1``
+
+    :return: an iterator over the tuple ``(path, result)`` in the order in
+        which files are loaded, where ``result`` is the license, or the
+        exception raised when loading or verifying it; exceptions other than
+        :class:`EnvironmentError`, :class:`ValueError` and the exceptions
+        of :class:`truepy.License` are reported as :class:`ValueError`
+    :rtype: iterator of (str, truepy.License or Exception)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError('invalid number of workers: %s', workers)
+
+    if isinstance(certificate, cryptography.x509.Certificate):
+        certificate = certificate.public_bytes(serialization.Encoding.PEM)
+
+    key, iv = License._key_iv(password)
+    paths = glob.iglob(os.path.join(glob.escape(path), pattern))
+
+    return _load_directory(
+        paths, key, iv, certificate, workers, get_xml_backend())
+
+
+def _load_directory(paths, key, iv, certificate, workers, xml_backend):
+    """Loads license files using a pool of processes.
+
+    See :func:`load_directory` for a description of the parameters.
+
+    :param paths: The paths of the files to load.
+    :type paths: iterator of str
+
+    :param bytes key: The DES key.
+
+    :param bytes iv: The DES IV.
+
+    :param str xml_backend: The name of the XML backend to use.
+
+    :return: an iterator over the tuple ``(path, result)``
+    """
+    chunks = iter(lambda: list(itertools.islice(paths, _CHUNK_SIZE)), [])
+    with concurrent.futures.ProcessPoolExecutor(
+            workers,
+            initializer=_initialize,
+            initargs=(key, iv, certificate, xml_backend)) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(_load, chunk))
+            if len(pending) < workers * _TASKS_PER_WORKER:
+                continue
+
+            done, pending = concurrent.futures.wait(
+                pending,
+                return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    yield result
+
+        for future in concurrent.futures.as_completed(pending):
+            for result in future.result():
+                yield result
+
+
+def _initialize(key, iv, certificate, xml_backend):
+    """Initialises a worker process started by :func:`load_directory`.
+
+    :param bytes key: The DES key.
+
+    :param bytes iv: The DES IV.
+
+    :param bytes certificate: The *PEM* encoded issuer certificate, or
+        ``None``.
+
+    :param str xml_backend: The name of the XML backend to use.
+    """
+    set_xml_backend(xml_backend)
+    _state['key'] = key
+    _state['iv'] = iv
+    _state['verifier'] = Verifier(certificate) \
+        if certificate is not None \
+        else None
+
+
+def _load(paths):
+    """Loads license files in a worker process started by
+    :func:`load_directory`.
+
+    :param paths: The paths of the files to load.
+    :type paths: list of str
+
+    :return: the tuple ``(path, result)`` for every file
+    :rtype: list of (str, truepy.License or Exception)
+    """
+    results = []
+    verifier = _state['verifier']
+    for path in paths:
+        try:
+            license = License._load_path(path, _state['key'], _state['iv'])
+            if verifier is not None:
+                verifier.verify(license)
+            results.append((path, license))
+        except (
+                EnvironmentError,
+                ValueError,
+                License.InvalidPasswordException,
+                License.InvalidSignatureException) as e:
+            results.append((path, e))
+        except Exception as e:
+            # Exceptions are pickled when passed to the parent process, and
+            # not all exceptions, such as those raised by lxml, support that
+            results.append((path, ValueError(
+                '%s: %s' % (e.__class__.__name__, e))))
+    return results
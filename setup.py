@@ -14,7 +14,7 @@ PACKAGE_DIR = {
 
 
 REQUIREMENTS = [
-    'cryptography >=1.0',
+    'cryptography >=1.5',
     'pycryptodome >=3.9.4']
 
 
@@ -17,13 +17,17 @@
 
 import unittest
 
+import io
 
 from datetime import datetime
 
 from truepy import fromstring, tostring
 from truepy._bean import snake_to_camel, camel_to_snake
 from truepy._bean import value_to_xml
-from truepy._bean import deserialize, serialize, to_document
+from truepy._bean import deserialize, serialize, to_document, write_document
+from truepy._bean import emit, encode_document, value_to_text
+from truepy._bean import bean_deserializer, UnknownFragmentException
+from truepy._bean import _DESERIALIZERS, _DESERIALIZER_INDEX, _PLANS
 from truepy._bean_serializers import _DESERIALIZER_CLASSES, bean_class
 
 
@@ -63,6 +67,18 @@ class BeanTest(unittest.TestCase):
             '</object>',
             tostring(value_to_xml('value', 'tag', 'test')))
 
+    def test_value_to_text(self):
+        """Tests that value_to_text creates the same text as value_to_xml"""
+        for args in (
+                ('value', 'test'),
+                ('', 'test'),
+                ('<&>"', 'test'),
+                ('value', 'tag', 'test'),
+                ('', 'tag', 'test"\n')):
+            self.assertEqual(
+                tostring(value_to_xml(*args)),
+                value_to_text(*args))
+
     def test_serialize_unknown(self):
         """Serialises an unknown value"""
         class unknown(object):
@@ -118,6 +134,39 @@ class BeanTest(unittest.TestCase):
             '</object>',
             tostring(serialize(test())))
 
+    def test_serialize_registered_plan(self):
+        """Serialises an object using the plan compiled by bean_class"""
+        class_name = 'test.class'
+
+        try:
+            @bean_class(class_name)
+            class test(object):
+                @property
+                def test_b(self):
+                    return 2
+
+                @property
+                def test_a(self):
+                    return 1
+
+            self.assertEqual(
+                ('testA', 'testB'),
+                tuple(name for getter, name in _PLANS[test]))
+            self.assertEqual(
+                '<object class="test.class">'
+                '<void property="testA">'
+                '<int>1</int>'
+                '</void>'
+                '<void property="testB">'
+                '<int>2</int>'
+                '</void>'
+                '</object>',
+                tostring(serialize(test())))
+
+        finally:
+            del _DESERIALIZER_CLASSES[class_name]
+            del _PLANS[test]
+
     def test_serialize_datetime(self):
         """Serialises datetime instances"""
         self.assertEqual(
@@ -195,6 +244,112 @@ class BeanTest(unittest.TestCase):
         finally:
             del _DESERIALIZER_CLASSES[class_name]
 
+    def test_deserialize_registered(self):
+        """Deserialises a fragment using a deserialiser registered for its tag
+        and class"""
+        key = ('test', 'test.class')
+        try:
+            @bean_deserializer(*key)
+            def deserializer(element):
+                return element.text
+
+            self.assertEqual(
+                'hello world',
+                deserialize(fromstring(
+                    '<test class="test.class">hello world</test>')))
+            with self.assertRaises(ValueError):
+                deserialize(fromstring('<test>hello world</test>'))
+
+        finally:
+            del _DESERIALIZER_INDEX[key]
+
+    def test_deserialize_fallback(self):
+        """Deserialises a fragment using a deserialiser not registered for a
+        specific tag"""
+        try:
+            @bean_deserializer
+            def deserializer(element):
+                if element.tag == 'test':
+                    return element.text
+                else:
+                    raise UnknownFragmentException()
+
+            self.assertEqual(
+                'hello world',
+                deserialize(fromstring(
+                    '<test class="any">hello world</test>')))
+
+        finally:
+            _DESERIALIZERS.remove(deserializer)
+
+    def test_deserialize_primitives(self):
+        """Deserialises long, double and null values"""
+        self.assertEqual(
+            1388534400000,
+            deserialize(fromstring('<long>1388534400000</long>')))
+        self.assertEqual(
+            0.5,
+            deserialize(fromstring('<double>0.5</double>')))
+        self.assertEqual(
+            None,
+            deserialize(fromstring('<null />')))
+
+    def test_deserialize_collections(self):
+        """Deserialises nested lists and maps"""
+        self.assertEqual(
+            {'features': ['a', 'b'], 'seats': 5, 'expires': None},
+            deserialize(fromstring(
+                '<object class="java.util.HashMap">'
+                '<void method="put">'
+                '<string>features</string>'
+                '<object class="java.util.ArrayList">'
+                '<void method="add"><string>a</string></void>'
+                '<void method="add"><string>b</string></void>'
+                '</object>'
+                '</void>'
+                '<void method="put">'
+                '<string>seats</string>'
+                '<int>5</int>'
+                '</void>'
+                '<void method="put">'
+                '<string>expires</string>'
+                '<null />'
+                '</void>'
+                '</object>')))
+        with self.assertRaises(ValueError):
+            deserialize(fromstring(
+                '<object class="java.util.ArrayList">'
+                '<void method="put">'
+                '<string>a</string>'
+                '<string>b</string>'
+                '</void>'
+                '</object>'))
+
+    def test_deserialize_nested(self):
+        """Deserialises an object containing an object with properties"""
+        class_name = 'test.class'
+
+        try:
+            @bean_class(class_name)
+            class test(object):
+                def __init__(self, a):
+                    self.a = a
+
+            o = deserialize(fromstring(
+                '<object class="test.class">'
+                '<void property="a">'
+                '<object class="test.class">'
+                '<void property="a">'
+                '<string>hello world</string>'
+                '</void>'
+                '</object>'
+                '</void>'
+                '</object>'))
+            self.assertEqual('hello world', o.a.a)
+
+        finally:
+            del _DESERIALIZER_CLASSES[class_name]
+
     def test_deserialize_datetime(self):
         """Deserialises datetime objects"""
         expected = datetime.strptime('2014-01-01 UTC', '%Y-%m-%d %Z')
@@ -213,3 +368,74 @@ class BeanTest(unittest.TestCase):
                     to_document(
                         serialize(expected)))
                 [0]))
+
+    def test_write_document(self):
+        """Tests that write_document writes the same document as to_document
+        creates"""
+        class test(object):
+            bean_class = 'test.class'
+
+            @property
+            def test_property(self):
+                return u'\xe5 & <value>'
+
+        f = io.BytesIO()
+        write_document(test(), f)
+        self.assertEqual(
+            to_document(serialize(test())).encode('ascii'),
+            f.getvalue())
+
+    def test_emit(self):
+        """Tests that emit creates the same text as serialize"""
+        class test(object):
+            bean_class = 'test.class'
+
+            @property
+            def test_property(self):
+                return True
+
+        class empty(object):
+            bean_class = 'test.class'
+
+        for value in (
+                True,
+                False,
+                42,
+                -1,
+                '',
+                'hello world',
+                u'\xe5 & <value> "quoted"\n',
+                datetime.strptime('1970-01-01 UTC', '%Y-%m-%d %Z'),
+                datetime.strptime(
+                    '1960-06-01 12:34:56.789',
+                    '%Y-%m-%d %H:%M:%S.%f'),
+                test(),
+                empty()):
+            fragments = []
+            emit(value, fragments.append)
+            self.assertEqual(
+                tostring(serialize(value)),
+                ''.join(fragments).encode(
+                    'ascii', 'xmlcharrefreplace').decode('ascii'))
+
+    def test_emit_unknown(self):
+        """Tests that emit fails for unknown values"""
+        class unknown(object):
+            pass
+
+        with self.assertRaises(ValueError):
+            emit(unknown(), lambda s: None)
+
+    def test_encode_document(self):
+        """Tests that encode_document creates the same document as
+        to_document"""
+        class test(object):
+            bean_class = 'test.class'
+
+            @property
+            def test_property(self):
+                return u'\xe5 & <value>'
+
+        self.assertEqual(
+            to_document(serialize(test())).encode('ascii'),
+            encode_document(test()))
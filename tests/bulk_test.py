@@ -0,0 +1,147 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+import gzip
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from Crypto.Cipher import DES
+
+from truepy import License, LicenseCodec, LicenseData
+from truepy import get_xml_backend, set_xml_backend
+from truepy.bulk import load_directory
+
+from .license_test import CERTIFICATE, OTHER_CERTIFICATE, key
+
+
+class BulkTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = get_xml_backend()
+        self.directory = tempfile.mkdtemp()
+        codec = LicenseCodec(b'valid password')
+        self.expected = {}
+        for i in range(40):
+            license = License.issue(
+                CERTIFICATE,
+                key(),
+                license_data=LicenseData(
+                    '2014-01-01T00:00:00',
+                    '2014-01-01T00:00:01',
+                    info=str(i)))
+            path = self.path('%d.lic' % i)
+            with open(path, 'wb') as f:
+                f.write(codec.dumps(license))
+            self.expected[path] = license.encoded
+
+        with open(self.path('invalid.lic'), 'wb') as f:
+            f.write(b'invalid data')
+        with open(self.path('ignored.txt'), 'wb') as f:
+            f.write(b'invalid data')
+
+    def tearDown(self):
+        set_xml_backend(self.backend)
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_load_directory(self):
+        """Tests that load_directory loads all matching files"""
+        results = dict(load_directory(
+            self.directory,
+            b'valid password',
+            workers=2))
+        self.assertEqual(
+            set(self.expected) | {self.path('invalid.lic')},
+            set(results))
+        self.assertIsInstance(
+            results.pop(self.path('invalid.lic')),
+            ValueError)
+        self.assertEqual(
+            self.expected,
+            {
+                path: license.encoded
+                for path, license in results.items()})
+
+    def test_load_directory_invalid_xml(self):
+        """Tests that load_directory reports invalid XML documents per file
+        using the selected XML backend for all process start methods"""
+        key, iv = License._key_iv(b'valid password')
+        with open(self.path('corrupt.lic'), 'wb') as f:
+            f.write(DES.new(key=key, IV=iv, mode=DES.MODE_CBC).encrypt(
+                License._pad(gzip.compress(b'<java><object'))))
+
+        start_method = multiprocessing.get_start_method(allow_none=True)
+        try:
+            for method in multiprocessing.get_all_start_methods():
+                multiprocessing.set_start_method(method, force=True)
+                for backend, error in (
+                        ('stdlib', 'ParseError'),
+                        ('lxml', 'XMLSyntaxError')):
+                    try:
+                        set_xml_backend(backend)
+                    except ValueError:
+                        continue
+                    ((path, result),) = load_directory(
+                        self.directory,
+                        b'valid password',
+                        workers=1,
+                        pattern='corrupt.lic')
+                    self.assertEqual(self.path('corrupt.lic'), path)
+                    self.assertIsInstance(result, ValueError)
+                    self.assertTrue(
+                        result.args[0].startswith(error),
+                        (method, backend))
+        finally:
+            multiprocessing.set_start_method(start_method, force=True)
+
+    def test_load_directory_invalid_password(self):
+        """Tests that load_directory reports invalid passwords per file"""
+        for path, result in load_directory(
+                self.directory,
+                b'invalid password',
+                workers=2,
+                pattern='1*.lic'):
+            self.assertIsInstance(result, License.InvalidPasswordException)
+
+    def test_load_directory_verify(self):
+        """Tests that load_directory verifies signatures"""
+        for path, result in load_directory(
+                self.directory,
+                b'valid password',
+                certificate=CERTIFICATE,
+                workers=2,
+                pattern='*[0-9].lic'):
+            self.assertIsInstance(result, License)
+
+        for path, result in load_directory(
+                self.directory,
+                b'valid password',
+                certificate=License._certificate(OTHER_CERTIFICATE),
+                workers=2,
+                pattern='*[0-9].lic'):
+            self.assertIsInstance(result, License.InvalidSignatureException)
+
+    def test_load_directory_invalid_workers(self):
+        """Tests that load_directory fails for an invalid number of
+        workers"""
+        with self.assertRaises(ValueError):
+            load_directory(self.directory, b'valid password', workers=0)
@@ -0,0 +1,159 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from truepy._cache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_get_missing(self):
+        """Tests that LRUCache.get returns the default value for missing
+        keys"""
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(42, cache.get('a', 42))
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(0, cache.hits)
+
+    def test_get_present(self):
+        """Tests that LRUCache.get returns cached values"""
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(0, cache.misses)
+
+    def test_evict_least_recently_used(self):
+        """Tests that the least recently used entry is evicted"""
+        evicted = []
+        cache = LRUCache(2, on_evict=lambda k, v: evicted.append((k, v)))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual([('b', 2)], evicted)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(1, cache.evictions)
+
+    def test_replace(self):
+        """Tests that replaced values are passed to the eviction callback"""
+        evicted = []
+        cache = LRUCache(2, on_evict=lambda k, v: evicted.append((k, v)))
+        cache.put('a', 1)
+        cache.put('a', 2)
+        self.assertEqual([('a', 1)], evicted)
+        self.assertEqual(2, cache.get('a'))
+
+    def test_resize(self):
+        """Tests that shrinking the cache evicts entries"""
+        cache = LRUCache(3)
+        for i in range(3):
+            cache.put(i, i)
+        cache.size = 1
+        self.assertEqual(1, len(cache))
+        self.assertIn(2, cache)
+
+    def test_disabled(self):
+        """Tests that a cache of size 0 stores nothing"""
+        cache = LRUCache(0)
+        cache.put('a', 1)
+        self.assertEqual(0, len(cache))
+        with self.assertRaises(ValueError):
+            LRUCache(-1)
+
+    def test_ttl(self):
+        """Tests that entries expire after the TTL"""
+        now = [0.0]
+        evicted = []
+        cache = LRUCache(
+            2,
+            on_evict=lambda k, v: evicted.append((k, v)),
+            ttl=10,
+            clock=lambda: now[0])
+        cache.put('a', 1)
+        now[0] = 9.5
+        self.assertEqual(1, cache.get('a'))
+        self.assertIn('a', cache)
+        now[0] = 10.0
+        self.assertNotIn('a', cache)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual([('a', 1)], evicted)
+        self.assertEqual(0, len(cache))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_lookup(self):
+        """Tests that LRUCache.lookup only calls the factory on misses"""
+        calls = []
+
+        def factory(key):
+            calls.append(key)
+            return key * 2
+
+        cache = LRUCache(2)
+        self.assertEqual(4, cache.lookup(2, factory))
+        self.assertEqual(4, cache.lookup(2, factory))
+        self.assertEqual([2], calls)
+
+    def test_lookup_concurrent(self):
+        """Tests that LRUCache.lookup keeps the value cached first when the
+        factory is called concurrently"""
+        evicted = []
+        values = iter(['first', 'second'])
+
+        def factory(key):
+            value = next(values)
+            if value == 'first':
+                self.assertEqual('second', cache.lookup(key, factory))
+            return value
+
+        cache = LRUCache(2, on_evict=lambda k, v: evicted.append((k, v)))
+        self.assertEqual('second', cache.lookup('a', factory))
+        self.assertEqual('second', cache.get('a'))
+        self.assertEqual([], evicted)
+
+    def test_lookup_copy(self):
+        """Tests that LRUCache.lookup returns copies of cached values"""
+        cache = LRUCache(2)
+        value = cache.lookup('a', lambda key: [key], list)
+        self.assertEqual(['a'], value)
+        self.assertIsNot(cache.get('a'), value)
+        self.assertIsNot(cache.lookup('a', None, list), cache.get('a'))
+
+    def test_put_keep(self):
+        """Tests that LRUCache.put keeps cached values unless replacing"""
+        evicted = []
+        cache = LRUCache(2, on_evict=lambda k, v: evicted.append((k, v)))
+        cache.put('a', 1)
+        self.assertEqual(1, cache.put('a', 2, replace=False))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual([], evicted)
+
+    def test_clear(self):
+        """Tests that LRUCache.clear removes all entries and resets
+        statistics"""
+        evicted = []
+        cache = LRUCache(2, on_evict=lambda k, v: evicted.append((k, v)))
+        cache.put('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual([('a', 1)], evicted)
+        self.assertEqual(
+            dict(hits=0, misses=0, evictions=0, size=2, length=0),
+            cache.stats())
@@ -0,0 +1,88 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+import io
+import os
+import shutil
+import tempfile
+
+from truepy import License, LicenseCodec, LicenseData
+
+from .license_test import CERTIFICATE, key, license
+
+
+class LicenseCodecTest(unittest.TestCase):
+    def test_load(self):
+        """Tests that LicenseCodec.load succeeds with valid license data"""
+        self.assertIsInstance(
+            LicenseCodec(b'valid password').load(license()),
+            License)
+
+    def test_load_invalid_password(self):
+        """Tests that LicenseCodec.load fails for an invalid password"""
+        with self.assertRaises(License.InvalidPasswordException):
+            LicenseCodec(b'invalid password').load(license())
+
+    def test_load_path(self):
+        """Tests that LicenseCodec.load_path succeeds with a valid license
+        file"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'license.lic')
+            with open(path, 'wb') as f:
+                f.write(license().read())
+            self.assertEqual(
+                License.load(license(), b'valid password').encoded,
+                LicenseCodec(b'valid password').load_path(path).encoded)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_loads(self):
+        """Tests that LicenseCodec.loads succeeds with valid license data"""
+        self.assertIsInstance(
+            LicenseCodec(b'valid password').loads(license().read()),
+            License)
+
+    def test_store(self):
+        """Tests that a license stored with a codec can be loaded"""
+        codec = LicenseCodec(b'valid password')
+        f = io.BytesIO()
+        codec.store(
+            License.issue(
+                CERTIFICATE,
+                key(),
+                license_data=LicenseData(
+                    '2014-01-01T00:00:00',
+                    '2014-01-01T00:00:01')),
+            f)
+        License.load(io.BytesIO(f.getvalue()), b'valid password')
+
+    def test_dumps(self):
+        """Tests that a license dumped with a codec can be loaded"""
+        codec = LicenseCodec(b'valid password')
+        data = codec.dumps(
+            License.issue(
+                CERTIFICATE,
+                key(),
+                license_data=LicenseData(
+                    '2014-01-01T00:00:00',
+                    '2014-01-01T00:00:01')))
+        self.assertEqual(
+            codec.loads(data).encoded,
+            License.load(io.BytesIO(data), b'valid password').encoded)
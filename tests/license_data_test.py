@@ -15,10 +15,14 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
+import json
 import unittest
 
+from datetime import datetime
+
 from truepy import LicenseData, Name, fromstring, tostring
 from truepy._bean import deserialize, serialize
+from truepy._bean_serializers import default_bean_deserialize
 
 
 class LicenseDataTest(unittest.TestCase):
@@ -33,6 +37,14 @@ class LicenseDataTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             LicenseData('2014-01-01T00:00:01', '2014-01-01T00:00:00')
 
+    def test_slots(self):
+        """Test that LicenseData instances are immutable"""
+        license = LicenseData('2014-01-01T00:00:00', '2014-01-01T00:00:01')
+        with self.assertRaises(AttributeError):
+            license.attribute = 'value'
+        with self.assertRaises(AttributeError):
+            license.info = 'value'
+
     def test_issued_unspecified(self):
         """Test LicenseData.issued for unspecified issued value"""
         license = LicenseData(
@@ -48,6 +60,18 @@ class LicenseDataTest(unittest.TestCase):
             '2014-01-01T00:00:01')
         self.assertEqual(license.issued, license.not_after)
 
+    def test_milliseconds_timestamps(self):
+        """Test LicenseData() for timestamps in milliseconds"""
+        license = LicenseData(0, 1388534400000)
+        self.assertEqual('1970-01-01 00:00:00', str(license.not_before))
+        self.assertEqual('2014-01-01 00:00:00', str(license.not_after))
+        self.assertEqual(license.not_before, license.issued)
+
+    def test_issued_epoch(self):
+        """Test LicenseData.issued for an issued value at the epoch"""
+        license = LicenseData(1000, 1388534400000, 0)
+        self.assertEqual('1970-01-01 00:00:00', str(license.issued))
+
     def test_invalid_timestamps(self):
         """Test LicenseData() for invalid timestamps"""
         with self.assertRaises(ValueError):
@@ -207,6 +231,14 @@ class LicenseDataTest(unittest.TestCase):
             extra=extra)
         self.assertEqual(expected, license.extra)
 
+    def test_timestamp_extra(self):
+        """Test LicenseData() for extra data containing timestamps"""
+        license = LicenseData(
+            '2014-01-01T00:00:00',
+            '2014-01-01T00:00:01',
+            extra={'expires': [datetime(2014, 1, 1)]})
+        self.assertEqual('{"expires": [1388534400000]}', license.extra)
+
     def test_serialize(self):
         """Tests that a LicenseData can be serialised to XML"""
         expected = tostring(fromstring(
@@ -290,3 +322,174 @@ class LicenseDataTest(unittest.TestCase):
         self.assertEqual(
             license_data1.extra,
             license_data2.extra)
+
+    def test_deserialize_generic(self):
+        """Tests that LicenseData._bean_deserialize returns the same value as
+        the generic deserialiser"""
+        element = serialize(LicenseData(
+            '2014-01-01T00:00:00',
+            '2014-01-01T00:00:01',
+            '2014-01-01T00:00:01',
+            issuer='CN=issuer',
+            holder='CN=holder,O=organisation',
+            subject='subject',
+            consumer_type='consumer type',
+            info='some information',
+            extra={'hello': 'world'}))
+        self.assertEqual(
+            tostring(serialize(
+                default_bean_deserialize(LicenseData, element))),
+            tostring(serialize(LicenseData._bean_deserialize(element))))
+
+    def test_deserialize_unexpected(self):
+        """Tests that LicenseData._bean_deserialize falls back to the generic
+        deserialiser for unexpected fragments"""
+        license_data = deserialize(fromstring(
+            '<object class="de.schlichtherle.license.LicenseContent">'
+            '<void property="notAfter">'
+            '<object class="java.util.Date">'
+            '<long>1388534401000</long>'
+            '</object>'
+            '</void>'
+            '<void property="notBefore">'
+            '<object class="java.util.Date">'
+            '<long>1388534400000</long>'
+            '</object>'
+            '</void>'
+            '<void property="subject">'
+            '<int>42</int>'
+            '</void>'
+            '</object>'))
+        self.assertEqual('42', license_data.subject)
+
+    def test_deserialize_missing(self):
+        """Tests that LicenseData._bean_deserialize fails for fragments without
+        a validity window"""
+        with self.assertRaises(ValueError):
+            deserialize(fromstring(
+                '<object class="de.schlichtherle.license.LicenseContent">'
+                '<void property="info">'
+                '<string>info</string>'
+                '</void>'
+                '</object>'))
+
+    def test_deserialize_invalid(self):
+        """Tests that LicenseData._bean_deserialize reports errors raised by
+        the constructor"""
+        with self.assertRaises(ValueError) as cm:
+            deserialize(fromstring(
+                '<object class="de.schlichtherle.license.LicenseContent">'
+                '<void property="notAfter">'
+                '<object class="java.util.Date">'
+                '<long>1388534400000</long>'
+                '</object>'
+                '</void>'
+                '<void property="notBefore">'
+                '<object class="java.util.Date">'
+                '<long>1388534401000</long>'
+                '</object>'
+                '</void>'
+                '</object>'))
+        self.assertIn('is not before', cm.exception.args[0])
+
+    def test_deserialize_structured_extra(self):
+        """Tests that LicenseData can be deserialised with a structured extra
+        value"""
+        license_data = deserialize(fromstring(
+            '<object class="de.schlichtherle.license.LicenseContent">'
+            '<void property="extra">'
+            '<object class="java.util.HashMap">'
+            '<void method="put">'
+            '<string>features</string>'
+            '<object class="java.util.ArrayList">'
+            '<void method="add"><string>a</string></void>'
+            '</object>'
+            '</void>'
+            '</object>'
+            '</void>'
+            '<void property="notAfter">'
+            '<object class="java.util.Date">'
+            '<long>1388534401000</long>'
+            '</object>'
+            '</void>'
+            '<void property="notBefore">'
+            '<object class="java.util.Date">'
+            '<long>1388534400000</long>'
+            '</object>'
+            '</void>'
+            '</object>'))
+        self.assertEqual('{"features": ["a"]}', license_data.extra)
+
+    def deserialize_extra(self, extra):
+        return deserialize(fromstring(
+            '<object class="de.schlichtherle.license.LicenseContent">'
+            '<void property="extra">' + extra + '</void>'
+            '<void property="notAfter">'
+            '<object class="java.util.Date">'
+            '<long>1388534401000</long>'
+            '</object>'
+            '</void>'
+            '<void property="notBefore">'
+            '<object class="java.util.Date">'
+            '<long>1388534400000</long>'
+            '</object>'
+            '</void>'
+            '</object>'))
+
+    def test_deserialize_date_extra(self):
+        """Tests that LicenseData can be deserialised with a timestamp in the
+        extra value"""
+        license_data = self.deserialize_extra(
+            '<object class="java.util.ArrayList">'
+            '<void method="add">'
+            '<object class="java.util.Date">'
+            '<long>1388534400000</long>'
+            '</object>'
+            '</void>'
+            '</object>')
+        self.assertEqual('[1388534400000]', license_data.extra)
+
+    def test_deserialize_bean_extra(self):
+        """Tests that LicenseData can be deserialised with a bean in the extra
+        value"""
+        license_data = self.deserialize_extra(
+            '<object class="java.util.HashMap">'
+            '<void method="put">'
+            '<string>previous</string>'
+            '<object class="de.schlichtherle.license.LicenseContent">'
+            '<void property="holder">'
+            '<object class="javax.security.auth.x500.X500Principal">'
+            '<string>CN=holder</string>'
+            '</object>'
+            '</void>'
+            '<void property="notAfter">'
+            '<object class="java.util.Date">'
+            '<long>1000</long>'
+            '</object>'
+            '</void>'
+            '<void property="notBefore">'
+            '<object class="java.util.Date">'
+            '<long>0</long>'
+            '</object>'
+            '</void>'
+            '</object>'
+            '</void>'
+            '</object>')
+        previous = json.loads(license_data.extra)['previous']
+        self.assertEqual('CN=holder', previous['holder'])
+        self.assertEqual(0, previous['notBefore'])
+        self.assertEqual(1000, previous['notAfter'])
+        self.assertEqual(0, previous['issued'])
+        self.assertEqual('null', previous['extra'])
+
+    def test_deserialize_unhashable_extra(self):
+        """Tests that LicenseData cannot be deserialised with a map in the
+        extra value having a collection as key"""
+        with self.assertRaises(ValueError):
+            self.deserialize_extra(
+                '<object class="java.util.HashMap">'
+                '<void method="put">'
+                '<object class="java.util.ArrayList" />'
+                '<string>value</string>'
+                '</void>'
+                '</object>')
@@ -18,22 +18,33 @@
 import unittest
 
 import base64
+import gzip
 import io
+import os
+import pickle
+import shutil
+import tempfile
+
+from Crypto.Cipher import DES
 
 from cryptography.hazmat import backends
 from cryptography.hazmat.primitives import serialization
 
-from truepy import LicenseData, License
-from truepy._bean import serialize, to_document
+from truepy import LicenseData, License, Name
+from truepy._bean import encode_document, serialize, to_document
 
 
 class LicenseTest(unittest.TestCase):
     def test_encoded_invalid(self):
-        """Tests that License() with invalid encoded data raises ValueError"""
+        """Tests that License() with invalid encoded data raises ValueError
+        when the data is decoded"""
+        license = License(
+            '<invalid/>',
+            '<signature>')
         with self.assertRaises(ValueError):
-            License(
-                '<invalid/>',
-                '<signature>')
+            license.data
+        with self.assertRaises(ValueError):
+            license.validate()
 
     def test_encoded_valid(self):
         """Tests that License() with valid encoded data has correct encoded
@@ -43,6 +54,47 @@ class LicenseTest(unittest.TestCase):
                 LicenseData('2014-01-01T00:00:00', '2014-01-01T00:00:01'))),
             '<signature>')
 
+    def test_data_lazy(self):
+        """Tests that License.data is decoded once, on first access"""
+        license = License(
+            to_document(serialize(
+                LicenseData('2014-01-01T00:00:00', '2014-01-01T00:00:01'))),
+            '<signature>')
+        self.assertFalse(hasattr(license, '_data'))
+        license.validate()
+        self.assertIs(license.data, license.data)
+        self.assertEqual(
+            '2014-01-01 00:00:01',
+            str(license.data.not_after))
+
+    def test_data_read_only(self):
+        """Tests that License.data cannot be assigned"""
+        license = License(
+            to_document(serialize(
+                LicenseData('2014-01-01T00:00:00', '2014-01-01T00:00:01'))),
+            '<signature>')
+        with self.assertRaises(AttributeError):
+            license.data = LicenseData(
+                '2014-01-01T00:00:00', '2014-01-01T00:00:02')
+        self.assertFalse(hasattr(license, '_data'))
+
+    def test_pickle(self):
+        """Tests that a license can be pickled with and without its decoded
+        data"""
+        license = License(
+            to_document(serialize(
+                LicenseData('2014-01-01T00:00:00', '2014-01-01T00:00:01'))),
+            '<signature>')
+        for i in range(2):
+            copy = pickle.loads(pickle.dumps(license))
+            self.assertEqual(hasattr(license, '_data'), hasattr(copy, '_data'))
+            self.assertEqual(license.encoded, copy.encoded)
+            self.assertEqual(license.signature, copy.signature)
+            self.assertEqual(
+                license.signature_algorithm,
+                copy.signature_algorithm)
+            self.assertEqual(license.data.not_after, copy.data.not_after)
+
     def test_signature_algorithm_invalid(self):
         """Tests License() for invalid signature_algorithm"""
         with self.assertRaises(ValueError):
@@ -102,6 +154,24 @@ class LicenseTest(unittest.TestCase):
                 key(),
                 not_before='2014-01-01T00:00:00')
 
+    def test_encode_document(self):
+        """Tests that licenses and license data are encoded exactly as when
+        serialising to elements"""
+        license_data = LicenseData(
+            '2014-01-01T00:00:00',
+            '2014-01-02T03:04:05',
+            issuer='CN=issuer,O=<organisation>',
+            holder=u'CN=h\xf6lder',
+            subject='subject & "more"',
+            consumer_type='',
+            info='\t\r\n',
+            extra={'hello': ['world', 42]})
+        license = License.issue(CERTIFICATE, key(), license_data=license_data)
+        for value in (license_data, license):
+            self.assertEqual(
+                to_document(serialize(value)).encode('ascii'),
+                encode_document(value))
+
     def test_issue_valid(self):
         """Tests that the signature is correctly constructed"""
         # Generated with command below:
@@ -135,6 +205,49 @@ class LicenseTest(unittest.TestCase):
                     '2014-01-01T00:00:00',
                     '2014-01-01T00:00:01')).signature)
 
+    def test_issue_many(self):
+        """Tests that License.issue_many issues licenses in order"""
+        license_data = [
+            LicenseData(
+                '2014-01-01T00:00:00',
+                '2014-01-01T00:00:01',
+                subject=str(i))
+            for i in range(20)]
+        streams = [io.BytesIO() for _ in license_data]
+
+        licenses = list(License.issue_many(
+            CERTIFICATE,
+            key(),
+            license_data,
+            workers=2,
+            password=b'valid password',
+            output=lambda i, license: streams[i]))
+
+        self.assertEqual(
+            [License.issue(CERTIFICATE, key(), license_data=d).signature
+             for d in license_data],
+            [license.signature for license in licenses])
+        self.assertEqual(
+            [license.encoded for license in licenses],
+            [
+                License.load(
+                    io.BytesIO(f.getvalue()),
+                    b'valid password').encoded
+                for f in streams])
+
+    def test_issue_many_invalid(self):
+        """Tests that License.issue_many fails for invalid arguments"""
+        with self.assertRaises(ValueError):
+            License.issue_many(
+                CERTIFICATE,
+                key(),
+                [],
+                output=lambda i, license: io.BytesIO())
+        with self.assertRaises(ValueError):
+            License.issue_many(OTHER_CERTIFICATE, key(), [])
+        with self.assertRaises(ValueError):
+            list(License.issue_many(CERTIFICATE, key(), [None], workers=1))
+
     def test_verify_invalid(self):
         """Tests that License.verify raises exception for invalid signatures"""
         with self.assertRaises(License.InvalidSignatureException):
@@ -155,6 +268,95 @@ class LicenseTest(unittest.TestCase):
                 '2014-01-01T00:00:00',
                 '2014-01-01T00:00:01')).verify(CERTIFICATE)
 
+    def test_key_iv_cached(self):
+        """Tests that License._key_iv caches derived keys"""
+        License.KEY_IV_CACHE.clear()
+        expected = License._key_iv(b'valid password')
+        self.assertEqual(expected, License._key_iv(b'valid password'))
+        self.assertEqual(1, License.KEY_IV_CACHE.hits)
+        self.assertEqual(1, License.KEY_IV_CACHE.misses)
+        self.assertNotEqual(expected, License._key_iv(b'other password'))
+
+    def test_key_iv_zeroed_on_evict(self):
+        """Tests that keys evicted from the cache are cleared"""
+        License.KEY_IV_CACHE.clear()
+        License._key_iv(b'valid password')
+        (cached,) = License.KEY_IV_CACHE._entries.values()
+        License.KEY_IV_CACHE.clear()
+        self.assertEqual(
+            [bytearray(8), bytearray(8)],
+            list(cached))
+
+    def test_key_iv_cache_key(self):
+        """Tests that the key cache is not keyed on the plain text password"""
+        License.KEY_IV_CACHE.clear()
+        License._key_iv(b'valid password')
+        (cache_key,) = License.KEY_IV_CACHE._entries.keys()
+        self.assertNotIn(b'valid password', cache_key)
+
+    def test_check_padding(self):
+        """Tests that License._check_padding accepts only valid padding"""
+        self.assertEqual(1, License._check_padding(b'1234567\x01'))
+        self.assertEqual(8, License._check_padding(b'\x08' * 8))
+        for block in (b'1234567\x00', b'123456\x01\x02', b'\x09' * 8):
+            with self.assertRaises(License.InvalidPasswordException):
+                License._check_padding(block)
+
+    def test_check_key(self):
+        """Tests that License._check_key rejects invalid passwords using
+        only the first and last blocks"""
+        data = license().read()
+        License._check_key(
+            data[:8], data[-16:], len(data),
+            *License._key_iv(b'valid password'))
+        with self.assertRaises(License.InvalidPasswordException):
+            License._check_key(
+                data[:8], data[-16:], len(data),
+                *License._key_iv(b'invalid password'))
+        with self.assertRaises(ValueError):
+            License._check_key(
+                data[:8], data[-16:], len(data) - 1,
+                *License._key_iv(b'valid password'))
+
+    def test_load_invalid_password_chunked(self):
+        """Tests that License.load fails for an invalid password when reading
+        from a non-seekable stream in chunks"""
+        class stream(object):
+            def __init__(self, f):
+                self.read = f.read
+
+        with self.assertRaises(License.InvalidPasswordException):
+            License.load(stream(license()), b'invalid password', chunk_size=64)
+
+    def test_certificate_cached(self):
+        """Tests that License._certificate caches parsed certificates"""
+        License.CERTIFICATE_CACHE.clear()
+        certificate = License._certificate(CERTIFICATE)
+        self.assertIs(certificate, License._certificate(CERTIFICATE))
+        self.assertIs(certificate, License._certificate(certificate))
+        self.assertIsNot(certificate, License._certificate(OTHER_CERTIFICATE))
+        self.assertEqual(
+            dict(hits=1, misses=2, evictions=0, size=16, length=2),
+            License.CERTIFICATE_CACHE.stats())
+
+    def test_issuer_cached(self):
+        """Tests that License.issue caches the issuer name of certificates"""
+        License.ISSUER_CACHE.clear()
+        for i in range(2):
+            license = License.issue(
+                CERTIFICATE,
+                key(),
+                not_before='2014-01-01T00:00:00',
+                not_after='2014-01-01T00:00:01')
+        certificate = License._certificate(CERTIFICATE)
+        self.assertEqual(
+            str(Name.from_x509_name(certificate.subject)),
+            str(license.data.issuer))
+        self.assertEqual(1, License.ISSUER_CACHE.hits)
+        self.assertEqual(1, License.ISSUER_CACHE.misses)
+        License._issuer(License._certificate(OTHER_CERTIFICATE))
+        self.assertEqual(2, len(License.ISSUER_CACHE))
+
     def test_load_invalid_data(self):
         """Tests that License.load fails for invalid license data"""
         with self.assertRaises(License.InvalidPasswordException):
@@ -169,6 +371,91 @@ class LicenseTest(unittest.TestCase):
         """Tests that License.load succeeds with valid license data"""
         License.load(license(), b'valid password')
 
+    def test_load_chunked(self):
+        """Tests that License.load succeeds with valid license data read in
+        chunks"""
+        expected = License.load(license(), b'valid password').encoded
+        for chunk_size in (1, 7, 8, 9, 1024):
+            self.assertEqual(
+                expected,
+                License.load(
+                    license(),
+                    b'valid password',
+                    chunk_size=chunk_size).encoded)
+
+    def test_load_invalid_length(self):
+        """Tests that License.load fails for data not a multiple of the block
+        size"""
+        with self.assertRaises(ValueError):
+            License.load(io.BytesIO(license().read()[:-1]), b'valid password')
+        with self.assertRaises(ValueError):
+            License.load(io.BytesIO(b''), b'valid password')
+
+    def test_load_truncated(self):
+        """Tests that License.load fails for truncated compressed data"""
+        f = io.BytesIO()
+        key, iv = License._key_iv(b'valid password')
+        des = DES.new(key=key, IV=iv, mode=DES.MODE_CBC)
+        f.write(des.encrypt(License._pad(
+            gzip.compress(b'<java><string /></java>')[:-4])))
+        with self.assertRaises(ValueError):
+            License.load(io.BytesIO(f.getvalue()), b'valid password')
+
+    def test_load_unexpected_element(self):
+        """Tests that License.load fails for a document not containing a
+        license"""
+        f = io.BytesIO()
+        key, iv = License._key_iv(b'valid password')
+        des = DES.new(key=key, IV=iv, mode=DES.MODE_CBC)
+        f.write(des.encrypt(License._pad(
+            gzip.compress(b'<java><string /></java>'))))
+        with self.assertRaises(ValueError):
+            License.load(io.BytesIO(f.getvalue()), b'valid password')
+
+    def test_load_any(self):
+        """Tests that License.load_any finds the valid password"""
+        passwords = [b'invalid password', b'valid password', b'other password']
+        license_, password = License.load_any(license(), passwords)
+        self.assertEqual(b'valid password', password)
+        self.assertEqual(
+            License.load(license(), b'valid password').encoded,
+            license_.encoded)
+
+    def test_load_path(self):
+        """Tests that License.load_path loads a license from a file"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'license.lic')
+            with open(path, 'wb') as f:
+                f.write(license().read())
+
+            expected = License.load(license(), b'valid password')
+            actual = License.load_path(path, b'valid password')
+            self.assertEqual(expected.encoded, actual.encoded)
+            self.assertEqual(expected.signature, actual.signature)
+            self.assertEqual(expected.data.issuer, actual.data.issuer)
+            with self.assertRaises(License.InvalidPasswordException):
+                License.load_path(path, b'invalid password')
+
+            with open(path, 'wb') as f:
+                f.write(license().read()[:-1])
+            with self.assertRaises(ValueError):
+                License.load_path(path, b'valid password')
+
+            with open(path, 'wb') as f:
+                pass
+            with self.assertRaises(ValueError):
+                License.load_path(path, b'valid password')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_load_any_invalid(self):
+        """Tests that License.load_any fails if no password is valid"""
+        with self.assertRaises(License.InvalidPasswordException):
+            License.load_any(license(), [b'invalid password'])
+        with self.assertRaises(License.InvalidPasswordException):
+            License.load_any(license(), [])
+
     def test_store(self):
         """Tests that a license can be loaded from the stored data"""
         f = io.BytesIO()
@@ -180,6 +467,30 @@ class LicenseTest(unittest.TestCase):
                 '2014-01-01T00:00:01')).store(f, b'valid password')
         License.load(io.BytesIO(f.getvalue()), b'valid password')
 
+    def test_store_incremental(self):
+        """Tests that License.store writes complete blocks as they become
+        available"""
+        class stream(object):
+            def __init__(self):
+                self.writes = []
+
+            def write(self, data):
+                self.writes.append(data)
+
+        f = stream()
+        License.issue(
+            CERTIFICATE,
+            key(),
+            license_data=LicenseData(
+                '2014-01-01T00:00:00',
+                '2014-01-01T00:00:01',
+                extra='x' * 100000)).store(f, b'valid password')
+        self.assertGreater(len(f.writes), 1)
+        self.assertTrue(all(
+            len(data) % License.BLOCK_SIZE == 0
+            for data in f.writes))
+        License.load(io.BytesIO(b''.join(f.writes)), b'valid password')
+
 
 CERTIFICATE = b'''
 -----BEGIN CERTIFICATE-----
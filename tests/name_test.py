@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
+import pickle
 import unittest
 
 import cryptography.hazmat.backends as backends
@@ -106,6 +107,37 @@ class NameTest(unittest.TestCase):
             [('CN', '<token>'), ('O', 'organisation')],
             Name('CN=#3Ctoken#3E,O=organisation'))
 
+    def test_hashable(self):
+        """Tests that equal names have the same hash and interned types"""
+        name1 = Name('CN=name,O=organisation')
+        name2 = Name(' CN = name , O=organisation')
+        self.assertEqual(name1, name2)
+        self.assertEqual(hash(name1), hash(name2))
+        self.assertIs(name1[0][0], name2[0][0])
+        self.assertEqual(1, len({name1, name2}))
+        self.assertNotEqual(name1, Name('CN=other'))
+        self.assertNotEqual(name1, [('CN', 'name')])
+
+    def test_cached(self):
+        """Tests that Name() returns the same instance for the same string"""
+        Name.CACHE.clear()
+        name = Name('CN=name,O=organisation')
+        self.assertIs(name, Name('CN=name,O=organisation'))
+        self.assertIsNot(name, Name('CN=name, O=organisation'))
+        self.assertEqual(1, Name.CACHE.hits)
+
+    def test_value_with_equals(self):
+        """Tests that Name() keeps equal signs in values"""
+        name = Name('CN=a=b,O=organisation')
+        self.assertEqual([('CN', 'a=b'), ('O', 'organisation')], name)
+        self.assertEqual('CN=a=b,O=organisation', str(name))
+
+    def test_pickle(self):
+        """Tests that a name can be pickled"""
+        name = Name('CN=#3Ctoken#3E,O=organisation')
+        self.assertEqual(name, pickle.loads(pickle.dumps(name)))
+        self.assertIsInstance(pickle.loads(pickle.dumps(name)), Name)
+
     def test_invalid_string(self):
         """Tests that Name() from invalid string raises ValueError"""
         with self.assertRaises(ValueError):
@@ -0,0 +1,74 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from datetime import datetime
+
+from truepy._timestamp import EPOCH, FORMAT, from_milliseconds, parse, \
+    to_milliseconds
+
+
+class TimestampTest(unittest.TestCase):
+    def test_to_milliseconds(self):
+        """Tests that to_milliseconds truncates towards zero"""
+        self.assertEqual(0, to_milliseconds(EPOCH))
+        self.assertEqual(
+            1388534400000,
+            to_milliseconds(datetime(2014, 1, 1)))
+        self.assertEqual(
+            1,
+            to_milliseconds(datetime(1970, 1, 1, 0, 0, 0, 1999)))
+        self.assertEqual(
+            -1,
+            to_milliseconds(datetime(1969, 12, 31, 23, 59, 59, 998001)))
+
+    def test_from_milliseconds(self):
+        """Tests that from_milliseconds is the inverse of to_milliseconds"""
+        for value in (-86400001, -1, 0, 1, 1388534400000, 253402300799999):
+            self.assertEqual(value, to_milliseconds(from_milliseconds(value)))
+
+    def test_parse(self):
+        """Tests that parse returns the same values as strptime"""
+        for value in (
+                '2014-01-01T00:00:00',
+                '1970-01-01T00:00:00',
+                '2016-02-29T23:59:59',
+                '2014-1-1T0:0:0'):
+            self.assertEqual(
+                datetime.strptime(value, FORMAT),
+                parse(value))
+
+    def test_parse_invalid(self):
+        """Tests that parse fails for invalid strings"""
+        for value in (
+                'invalid',
+                '2014-02-30T00:00:00',
+                '2014-01-01T24:00:00',
+                '2014-01-01 00:00:00',
+                '+014-01-01T00:00:00',
+                '2014-W01-1T00:00:00'):
+            with self.assertRaises(ValueError):
+                parse(value)
+
+    def test_parse_other(self):
+        """Tests that parse accepts datetimes and milliseconds"""
+        value = datetime(2014, 1, 1)
+        self.assertIs(value, parse(value))
+        self.assertEqual(value, parse(1388534400000))
+        with self.assertRaises(TypeError):
+            parse(True)
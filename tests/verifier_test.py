@@ -0,0 +1,130 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from truepy import License, LicenseData, LRUCache, Verifier
+
+from .license_test import CERTIFICATE, OTHER_CERTIFICATE, key
+
+
+class VerifierTest(unittest.TestCase):
+    def license(self, **kwargs):
+        return License.issue(
+            CERTIFICATE,
+            key(),
+            license_data=LicenseData(
+                '2014-01-01T00:00:00',
+                '2014-01-01T00:00:01'),
+            **kwargs)
+
+    def test_verify_valid(self):
+        """Tests that Verifier.verify does not raise exception for valid
+        certificate"""
+        verifier = Verifier(CERTIFICATE)
+        verifier.verify(self.license())
+        verifier.verify(self.license(digest='SHA256'))
+
+    def test_verify_invalid(self):
+        """Tests that Verifier.verify raises exception for invalid
+        signatures"""
+        with self.assertRaises(License.InvalidSignatureException):
+            Verifier(OTHER_CERTIFICATE).verify(self.license())
+
+    def test_verify_invalid_encoding(self):
+        """Tests that Verifier.verify raises exception for signatures that
+        are not base 64 encoded"""
+        license = self.license()
+        with self.assertRaises(License.InvalidSignatureException):
+            Verifier(CERTIFICATE).verify(License(
+                license.encoded,
+                license.signature[:-1]))
+
+    def test_verify_unknown_digest(self):
+        """Tests that Verifier.verify raises ValueError for unknown digest
+        algorithms"""
+        license = self.license()
+        with self.assertRaises(ValueError):
+            Verifier(CERTIFICATE).verify(License(
+                license.encoded,
+                license.signature,
+                'UNKNOWNwithRSA'))
+
+    def test_verify_mismatched_encryption(self):
+        """Tests that Verifier.verify raises exception for signature
+        encryption algorithms not matching the certificate key"""
+        license = self.license()
+        with self.assertRaises(License.InvalidSignatureException):
+            Verifier(CERTIFICATE).verify(License(
+                license.encoded,
+                license.signature,
+                'SHA1withDSA'))
+
+    def test_is_valid(self):
+        """Tests that Verifier.is_valid returns the signature validity"""
+        license = self.license()
+        self.assertTrue(Verifier(CERTIFICATE).is_valid(license))
+        self.assertFalse(Verifier(OTHER_CERTIFICATE).is_valid(license))
+
+    def test_verify_many(self):
+        """Tests that Verifier.verify_many returns results in order"""
+        valid = self.license()
+        invalid = License(valid.encoded, valid.signature[:-1])
+        results = list(Verifier(CERTIFICATE).verify_many(
+            [valid, invalid] * 10,
+            workers=3))
+        self.assertEqual(20, len(results))
+        self.assertEqual([None] * 10, results[::2])
+        self.assertTrue(all(
+            isinstance(result, License.InvalidSignatureException)
+            for result in results[1::2]))
+
+    def test_license_verify_many(self):
+        """Tests that License.verify_many verifies all licenses"""
+        license = self.license()
+        self.assertEqual(
+            [None, None],
+            list(License.verify_many([license, license], CERTIFICATE, 2)))
+        self.assertEqual(
+            [],
+            list(License.verify_many([], CERTIFICATE)))
+
+    def test_cache(self):
+        """Tests that only successful verifications are cached"""
+        cache = LRUCache(4, ttl=60)
+        valid = self.license()
+        renamed = License(valid.encoded, valid.signature, 'SHA256withRSA')
+
+        Verifier(CERTIFICATE, cache).verify(valid)
+        License(valid.encoded, valid.signature).verify(CERTIFICATE, cache)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+        with self.assertRaises(License.InvalidSignatureException):
+            Verifier(OTHER_CERTIFICATE, cache).verify(valid)
+        self.assertEqual(1, len(cache))
+
+        # The signature algorithm is part of the key
+        with self.assertRaises(License.InvalidSignatureException):
+            Verifier(CERTIFICATE, cache).verify(renamed)
+        self.assertEqual(1, len(cache))
+
+    def test_certificate(self):
+        """Tests that Verifier.certificate is the parsed certificate"""
+        self.assertIs(
+            License._certificate(CERTIFICATE),
+            Verifier(CERTIFICATE).certificate)
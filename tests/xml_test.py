@@ -0,0 +1,95 @@
+# coding: utf-8
+# truepy
+# Copyright (C) 2014-2020 Moses Palmér
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from truepy import LicenseData, get_xml_backend, set_xml_backend
+from truepy import _xml
+from truepy._bean import deserialize, serialize
+
+
+class XMLTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = get_xml_backend()
+
+    def tearDown(self):
+        set_xml_backend(self.backend)
+
+    def backends(self):
+        """Yields the names of all available backends, selecting each one in
+        turn"""
+        for name in _xml.BACKENDS:
+            try:
+                set_xml_backend(name)
+            except ValueError:
+                continue
+            yield name
+
+    def test_set_xml_backend(self):
+        """Tests that set_xml_backend selects the backend"""
+        set_xml_backend('stdlib')
+        self.assertEqual('stdlib', get_xml_backend())
+        set_xml_backend()
+        self.assertEqual('stdlib', get_xml_backend())
+        set_xml_backend('auto')
+        self.assertEqual(
+            'stdlib' if _xml.etree is None else 'lxml',
+            get_xml_backend())
+
+    def test_set_xml_backend_invalid(self):
+        """Tests that set_xml_backend fails for unknown backends"""
+        with self.assertRaises(ValueError):
+            set_xml_backend('invalid')
+
+    def test_fromstring_declaration(self):
+        """Tests that fromstring parses text with an encoding declaration"""
+        for name in self.backends():
+            element = _xml.fromstring(
+                u'<?xml version="1.0" encoding="ISO-8859-1"?>'
+                u'<string>h\xe9llo<!-- comment --></string>')
+            self.assertEqual(u'h\xe9llo', element.text, name)
+
+    def test_tostring(self):
+        """Tests that tostring returns the same text for all backends"""
+        texts = set()
+        for name in self.backends():
+            texts.add(_xml.tostring(serialize(LicenseData(
+                '2014-01-01T00:00:00',
+                '2014-01-01T00:00:01',
+                info=u'h\xe9llo <world>'))))
+        self.assertEqual(1, len(texts))
+
+    def test_deserialize(self):
+        """Tests that elements parsed by all backends can be deserialised"""
+        for name in self.backends():
+            license_data = deserialize(_xml.fromstring(
+                _xml.tostring(serialize(LicenseData(
+                    '2014-01-01T00:00:00',
+                    '2014-01-01T00:00:01',
+                    info='info')))))
+            self.assertEqual('info', license_data.info, name)
+
+    def test_parser(self):
+        """Tests that parser parses documents incrementally for all
+        backends"""
+        for name in self.backends():
+            parser = _xml.parser()
+            parser.feed(b'<java><string>')
+            parser.feed(b'value</string></java>')
+            element = parser.close()
+            self.assertEqual('java', element.tag, name)
+            self.assertEqual('value', element[0].text, name)